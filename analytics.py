@@ -0,0 +1,136 @@
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from disclosure import NUMBER_PATTERN, PERSONNEL_COUNT_PATTERN, PERSONNEL_TOTAL_PATTERN, DisclosureStats
+
+# Raw text column -> numeric column
+METRIC_COLUMNS = {
+    'it_investment_raw': 'it_investment',
+    'security_investment_raw': 'security_investment',
+    'it_personnel_raw': 'it_personnel',
+    'security_personnel_raw': 'security_personnel',
+}
+PERSONNEL_COLUMNS = ('it_personnel', 'security_personnel')
+DERIVED_COLUMNS = ('security_investment_ratio', 'dedicated_per_it_staff')
+
+
+def parse_numbers(series):
+    """
+    Vectorized equivalent of disclosure.parse_number: first number in each
+    string as float, NaN where there is none ("N/A", "Error", ...).
+    """
+    numbers = series.astype('string').str.extract(f'({NUMBER_PATTERN.pattern})', expand=False)
+    return pd.to_numeric(numbers.str.replace(',', '', regex=False), errors='coerce').astype('float64')
+
+def parse_personnel(series):
+    """
+    Vectorized equivalent of disclosure.parse_personnel: the 계 total, else
+    the sum of the 명 figures, else the first number.
+    """
+    text = series.astype('string')
+    total = parse_numbers(text.str.extract(PERSONNEL_TOTAL_PATTERN.pattern, expand=False))
+    counts = text.str.extractall(PERSONNEL_COUNT_PATTERN.pattern)[0]
+    counts = pd.to_numeric(counts.str.replace(',', '', regex=False), errors='coerce')
+    summed = counts.groupby(level=0).agg(['sum', 'count'])
+    summed = summed['sum'].where(summed['count'] > 1).reindex(series.index).round(2)
+    return total.fillna(summed).fillna(parse_numbers(series)).astype('float64')
+
+def rows_from_details(details_list, year, sector):
+    """
+    Flattens scraped details into the raw-text rows build_frame expects.
+    """
+    rows = []
+    for details in details_list:
+        stats = DisclosureStats.from_row(details['stats'])
+        row = {'company': details['name'], 'publish_no': details['publish_no'], 'year': year, 'sector': sector}
+        for field, metric in zip(stats._fields, stats):
+            row[f'{field}_raw'] = metric.raw
+        rows.append(row)
+    return rows
+
+def rows_from_crawl(path):
+    """
+    Rows for build_frame from crawler.py output (one JSON record per
+    disclosure, any number of sectors and years). Records without details are skipped.
+    """
+    rows = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('details'):
+                rows.extend(rows_from_details([record['details']], record['year'], record['sector']))
+    return rows
+
+def build_frame(rows):
+    """
+    Builds the analytics frame from rows with 'company', 'year', 'sector' and
+    the *_raw text columns. All parsing and derived metrics are column-wise:
+    - numeric metric columns parsed from the raw text
+    - security_investment_ratio: security / IT investment
+    - dedicated_per_it_staff: dedicated security staff / IT staff
+    - <metric>_yoy: change against the same company's previous year
+    - <metric>_pct: percentile within the same sector and year
+    """
+    df = pd.DataFrame(rows)
+    for raw_column, column in METRIC_COLUMNS.items():
+        if raw_column not in df:
+            df[column] = np.nan
+        elif column in PERSONNEL_COLUMNS:
+            df[column] = parse_personnel(df[raw_column])
+        else:
+            df[column] = parse_numbers(df[raw_column])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['security_investment_ratio'] = df['security_investment'] / df['it_investment'].replace(0, np.nan)
+        df['dedicated_per_it_staff'] = df['security_personnel'] / df['it_personnel'].replace(0, np.nan)
+
+    metrics = list(METRIC_COLUMNS.values()) + list(DERIVED_COLUMNS)
+    if 'year' in df and 'company' in df:
+        df['year'] = pd.to_numeric(df['year'], errors='coerce')
+        df = df.sort_values(['company', 'year'], kind='stable')
+        yoy = df.groupby('company', sort=False)[metrics].diff()
+        df[[f'{metric}_yoy' for metric in metrics]] = yoy.to_numpy()
+    if 'year' in df and 'sector' in df:
+        pct = df.groupby(['sector', 'year'], sort=False)[metrics].rank(pct=True)
+        df[[f'{metric}_pct' for metric in metrics]] = pct.to_numpy()
+    return df.reset_index(drop=True)
+
+def top(df, metric, n=20, year=None, sector=None):
+    """
+    The `n` rows with the highest `metric`, optionally limited to one year/sector.
+    """
+    mask = pd.Series(True, index=df.index)
+    if year is not None:
+        mask &= df['year'] == year
+    if sector is not None:
+        mask &= df['sector'] == sector
+    return df[mask].nlargest(n, metric)
+
+def main():
+    metrics = list(METRIC_COLUMNS.values()) + list(DERIVED_COLUMNS)
+    parser = argparse.ArgumentParser(description="Rank disclosures from a crawl (crawler.py) across sectors and years.")
+    parser.add_argument('details', nargs='?', default=os.path.join('crawl', 'details.jsonl'),
+                        help="details.jsonl written by crawler.py")
+    parser.add_argument('--metric', default='security_investment_ratio', choices=metrics)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--year', type=int, help="Only rank this publish year")
+    parser.add_argument('--sector', help="Only rank this sector")
+    parser.add_argument('--output', help="Also write the full frame (all metrics, _yoy, _pct) as CSV")
+    args = parser.parse_args()
+
+    df = build_frame(rows_from_crawl(args.details))
+    print(f"{len(df)} disclosures, {df['company'].nunique() if len(df) else 0} companies")
+    if df.empty:
+        return
+
+    columns = ['company', 'sector', 'year', args.metric, f'{args.metric}_yoy', f'{args.metric}_pct']
+    print(top(df, args.metric, args.top, args.year, args.sector)[columns].to_string(index=False))
+    if args.output:
+        # utf-8-sig so Excel opens the Korean text correctly
+        df.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"Frame saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,71 @@
-from flask import Flask, render_template, jsonify, request, redirect, url_for, flash
-import scraper
+from flask import Flask, render_template, jsonify, request, redirect, url_for, flash, make_response, Response
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from extensions import db, login_manager
-from models import User
+import scraper
+import metrics
+from models import User, Disclosure, hash_password, verify_password_hash
+from user_cache import UserCache
+from detail_cache import DetailCache
+from refresher import SnapshotRefresher
+from disclosure import DisclosureStats
+from payloads import PayloadCache, build_payload, pick_encoding, representation_etag, representation_etags
+from shared_store import SharedDetailCache, SqliteStore, open_store
+from table_store import TableTemplates
+from name_index import NameIndex
 from flask_login import login_user, login_required, logout_user, current_user
 
-app = Flask(__name__)
+# INSTANCE_PATH (absolute) moves users.db, the caches and snapshot.json elsewhere, e.g. for tests
+app = Flask(__name__, instance_path=os.environ.get('INSTANCE_PATH'))
 app.config['SECRET_KEY'] = 'dev-secret-key-change-this-in-prod'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(app.instance_path, 'users.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Detail cache: fresh for an hour, then served stale for up to a day until the refresher replaces it
+app.config['DETAIL_CACHE_TTL'] = 3600
+app.config['DETAIL_CACHE_STALE_TTL'] = 86400
+app.config['DETAIL_CACHE_SIZE'] = 256
+# Background scrape of the list and all details, started when the serving process
+# starts (python app.py, gunicorn) or with its first request (flask run)
+app.config['BACKGROUND_REFRESH'] = True
+app.config['REFRESH_INTERVAL'] = 3600
+app.config['REFRESH_MAX_PAGES'] = 4
+# With a shared store: the leader renews its refresh lease every third of this;
+# if it dies without handing the lease back another worker takes over after it
+app.config['REFRESH_LEASE_TTL'] = 60
+# Add per-stage Server-Timing headers to /api/company responses
+app.config['SERVER_TIMING'] = False
+# Serve /api/company from JSON serialized and compressed once per change, with ETags
+app.config['PRECOMPRESSED_PAYLOADS'] = True
+# home.html prefetches details of visible companies through /api/companies/details
+app.config['PREFETCH_DETAILS'] = True
+app.config['BULK_DETAILS_MAX'] = 50
+# Password hashing: werkzeug method string, e.g. pbkdf2:sha256:600000 or scrypt:32768:8:1.
+# Stored hashes made with other parameters are rehashed at the next successful login.
+app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256')
+# At most this many password hashes run at once per process, so a login burst
+# cannot take every core away from the API. The login request still waits for
+# its check; other requests keep being served only with threaded serving (the
+# dev server, or gunicorn.conf.py's gthread workers). Checks still queued after
+# the timeout are cancelled and the user gets a retry message.
+app.config['LOGIN_WORKERS'] = 2
+app.config['LOGIN_TIMEOUT'] = 10
+# current_user is rebuilt from this cache instead of the users table
+app.config['USER_CACHE_TTL'] = 60
+# Multi-process serving (gunicorn -c gunicorn.conf.py app:app): the snapshot and
+# details live in this store, shared by all workers, e.g. sqlite:///instance/shared.db
+# or redis://localhost:6379/0. Unset = single process, in-memory snapshot.
+app.config['SHARED_STORE'] = os.environ.get('SHARED_STORE')
+# Each process keeps its own prebuilt payloads (plain, gzip, brotli), each holding
+# the full table HTML three times: only this many hot companies, built on first request.
+app.config['PAYLOAD_CACHE_SIZE'] = 32
+# The app listens on 0.0.0.0, so /metrics only answers these client addresses
+# (a Prometheus on the same host) and logged-in admins; everyone else gets 404.
+# Behind a reverse proxy on this host every client looks local: block /metrics there.
+# Figures are kept per process. With several gunicorn workers each scrape is
+# answered by whichever worker takes it, so every series carries a worker="<pid>"
+# label: sum counters over it in Prometheus; quantiles only cover one worker each.
+app.config['METRICS_ALLOWED_IPS'] = ('127.0.0.1', '::1')
 
 # Ensure instance folder exists
 try:
@@ -21,25 +77,148 @@ db.init_app(app)
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+SHARED_STORE = open_store(app.config['SHARED_STORE']) if app.config['SHARED_STORE'] else None
+
+if SHARED_STORE is not None:
+    DETAIL_CACHE = SharedDetailCache(
+        SHARED_STORE,
+        ttl=app.config['DETAIL_CACHE_TTL'],
+        stale_ttl=app.config['DETAIL_CACHE_STALE_TTL']
+    )
+else:
+    DETAIL_CACHE = DetailCache(
+        os.path.join(app.instance_path, 'detail_cache.db'),
+        max_entries=app.config['DETAIL_CACHE_SIZE'],
+        ttl=app.config['DETAIL_CACHE_TTL'],
+        stale_ttl=app.config['DETAIL_CACHE_STALE_TTL']
+    )
+
+User.HASH_METHOD = app.config['PASSWORD_HASH_METHOD']
+USER_CACHE = UserCache(ttl=app.config['USER_CACHE_TTL'])
+LOGIN_EXECUTOR = ThreadPoolExecutor(max_workers=app.config['LOGIN_WORKERS'], thread_name_prefix='login')
+
+# Cached details keep only the figures of their status table; the shared markup
+# is stored once as a template and table_html is rendered when a payload is built
+TABLE_TEMPLATES = TableTemplates(SHARED_STORE or SqliteStore(os.path.join(app.instance_path, 'table_templates.db')))
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    columns = USER_CACHE.get(user_id)
+    if columns is None:
+        with metrics.timed('user_lookup'):
+            user = User.query.get(user_id)
+        if user is None:
+            return None
+        columns = user.cache_columns()
+        USER_CACHE.set(user_id, columns)
+    # Detached copy: only the cached columns, never added to a session
+    return User(**columns)
+
+def verify_login(user, password):
+    """
+    Checks the password on LOGIN_EXECUTOR and upgrades the stored hash if
+    PASSWORD_HASH_METHOD has changed. Returns True/False, or None if the
+    check did not finish within LOGIN_TIMEOUT.
+    """
+    future = LOGIN_EXECUTOR.submit(verify_password_hash, user.password_hash, password)
+    try:
+        ok = future.result(timeout=app.config['LOGIN_TIMEOUT'])
+    except FutureTimeout:
+        # Drops the check if it is still queued; one already hashing runs to completion
+        future.cancel()
+        metrics.increment('login_timeouts_total')
+        return None
+    if ok and user.needs_rehash():
+        user.password_hash = LOGIN_EXECUTOR.submit(hash_password, password, User.HASH_METHOD).result()
+        db.session.commit()
+        metrics.increment('password_rehash_total')
+    return ok
+
 
 
+PAYLOAD_CACHE = PayloadCache(max_entries=app.config['PAYLOAD_CACHE_SIZE'])
 
-# Cache for company list to avoid re-scraping on every reload
-# In a real app, this might be a database or Redis
-COMPANY_LIST_CACHE = []
+def detail_json(details):
+    """
+    The /api/company body for cached details (stats as a JSON object, table_html rendered).
+    """
+    details = TABLE_TEMPLATES.expand_details(details)
+    if details.get('stats'):
+        details = dict(details, stats=DisclosureStats.from_row(details['stats']).to_dict())
+    return details
+
+def detail_payload(publish_no, details):
+    # The refresher (this process's or, with a shared store, another worker's) may
+    # have stored new details since the payload was built: it is rebuilt when the
+    # snapshot's content hash moves on
+    version = REFRESHER.snapshot.content_hashes.get(publish_no)
+    payload = PAYLOAD_CACHE.get(publish_no, version)
+    if payload is None:
+        with metrics.timed('json_serialization'):
+            payload = PAYLOAD_CACHE.set(publish_no, build_payload(app.json.dumps(detail_json(details))), version)
+    return payload
+
+# The list and details are scraped by a background thread and swapped in
+# atomically; request handlers only ever read what it has stored.
+# Details live in DETAIL_CACHE, so keep it large enough to hold every company.
+def store_disclosures(details_list):
+    """
+    Saves freshly scraped details into the Disclosure table for /api/companies.
+    Their /api/company payloads are not prebuilt: a payload holds the expanded
+    table HTML in every encoding, so only hot companies are kept (PAYLOAD_CACHE_SIZE).
+    """
+    with app.app_context():
+        for details in details_list:
+            Disclosure.upsert(details, int(scraper.DEFAULT_YEAR), scraper.DEFAULT_SECTOR)
+        db.session.commit()
+
+REFRESHER = SnapshotRefresher(
+    DETAIL_CACHE,
+    max_pages=app.config['REFRESH_MAX_PAGES'],
+    interval=app.config['REFRESH_INTERVAL'],
+    on_details=store_disclosures,
+    store=SHARED_STORE,
+    lease_ttl=app.config['REFRESH_LEASE_TTL'],
+    templates=TABLE_TEMPLATES,
+    # Last list and content hashes, so a restart serves immediately instead of scraping first
+    snapshot_path=os.path.join(app.instance_path, 'snapshot.json')
+)
+
+def start_refresher():
+    """
+    Creates the tables the refresher writes to and starts it, once per process.
+    """
+    if REFRESHER.started:
+        return
+    with app.app_context():
+        try:
+            db.create_all()
+        except Exception as e:
+            # gunicorn workers start together; another one may have created the tables first
+            print(f"create_all skipped: {str(e).splitlines()[0]}")
+    REFRESHER.start()
+
+@app.before_request
+def ensure_refresher():
+    # Fallback for `flask run`; python app.py and gunicorn start it at process
+    # start. Not done at import: the debug reloader's watcher process imports the
+    # app too but never serves, and neither do scripts that only import this module
+    if app.config['BACKGROUND_REFRESH'] and not REFRESHER.started:
+        start_refresher()
 
 def get_companies():
-    global COMPANY_LIST_CACHE
-    if not COMPANY_LIST_CACHE:
-        # Try to load from json if exists
-        # Or scrape fresh
-        print("Scraping company list...")
-        # Scrape 4 pages as requested
-        COMPANY_LIST_CACHE = scraper.fetch_company_list(max_pages=4)
-    return COMPANY_LIST_CACHE
+    return REFRESHER.snapshot.companies
+
+# (refreshed_at, NameIndex) for the current snapshot; rebuilt after each refresh
+_name_index = (None, NameIndex([]))
+
+def get_name_index():
+    global _name_index
+    snapshot = REFRESHER.snapshot
+    if _name_index[0] != snapshot.refreshed_at:
+        _name_index = (snapshot.refreshed_at, NameIndex(snapshot.companies))
+    return _name_index[1]
 
 @app.route('/')
 def landing():
@@ -82,8 +261,11 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         user = User.query.filter_by(username=username).first()
-        
-        if user and user.check_password(password):
+        verified = verify_login(user, password) if user else False
+
+        if verified is None:
+            flash('로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.')
+        elif verified:
             if not user.is_approved:
                 flash('관리자 승인 대기 중입니다.')
             else:
@@ -104,20 +286,137 @@ def logout():
 @login_required
 def home():
     companies = get_companies()
-    return render_template('home.html', companies=companies)
+    return render_template('home.html', companies=companies,
+                           prefetch=app.config['PREFETCH_DETAILS'],
+                           bulk_max=app.config['BULK_DETAILS_MAX'])
 
 @app.route('/api/company/<publish_no>')
 @login_required
 def company_detail(publish_no):
+    token = metrics.start_request_timing()
     try:
-        details = scraper.fetch_company_detail(publish_no)
-        if details:
-            return jsonify(details)
+        response = make_response(_company_detail(publish_no))
+    finally:
+        timings = metrics.stop_request_timing(token)
+    if app.config['SERVER_TIMING']:
+        response.headers['Server-Timing'] = metrics.server_timing_header(timings)
+    return response
+
+def _company_detail(publish_no):
+    try:
+        with metrics.timed('detail_cache_lookup'):
+            details, _ = DETAIL_CACHE.get(publish_no)
+        metrics.increment('detail_requests_total', cache='hit' if details else 'miss')
+        if details and app.config['PRECOMPRESSED_PAYLOADS']:
+            return precompressed_response(detail_payload(publish_no, details))
+        elif details:
+            with metrics.timed('json_serialization'):
+                return jsonify(detail_json(details))
+        elif REFRESHER.snapshot.refreshed_at is None:
+            return jsonify({'error': '데이터를 준비 중입니다. 잠시 후 다시 시도해주세요.'}), 503
         else:
             return jsonify({'error': 'Details not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def precompressed_response(payload):
+    """
+    304 if the client already has this payload in any encoding, else the stored
+    bytes in the best encoding it accepts. Nothing is serialized or compressed here.
+    """
+    encoding, body = pick_encoding(payload, request.accept_encodings)
+    if any(request.if_none_match.contains(etag) for etag in representation_etags(payload)):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(representation_etag(payload, encoding))
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/api/companies/details')
+@login_required
+def company_details_bulk():
+    """
+    Details for many companies in one response: ?ids=3626,3627,...
+    Returns {'details': {publish_no: {...}}, 'missing': [...]} from the cache only.
+    """
+    ids = [i for i in request.args.get('ids', '').split(',') if i]
+    if len(ids) > app.config['BULK_DETAILS_MAX']:
+        return jsonify({'error': f"At most {app.config['BULK_DETAILS_MAX']} ids per request"}), 400
+
+    found = {}
+    missing = []
+    for publish_no in dict.fromkeys(ids):
+        details, _ = DETAIL_CACHE.get(publish_no)
+        metrics.increment('detail_requests_total', cache='hit' if details else 'miss')
+        if details:
+            found[publish_no] = detail_json(details)
+        else:
+            missing.append(publish_no)
+    with metrics.timed('json_serialization'):
+        return jsonify({'details': found, 'missing': missing})
+
+@app.route('/api/companies/search')
+@login_required
+def company_name_search():
+    """
+    Company names matching ?q= (exact, prefix, substring; fuzzy only if none), for the
+    sidebar search box. Ignores (주)/㈜/주식회사 and whitespace. ?limit= max 50.
+    """
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    with metrics.timed('name_search'):
+        companies = get_name_index().search(request.args.get('q', ''), limit)
+    return jsonify({'items': [
+        {'name': company['name'], 'publish_no': company['publish_no']} for company in companies
+    ]})
+
+@app.route('/api/companies')
+@login_required
+def company_search():
+    """
+    Filters, sorts and pages stored disclosures. No scraping happens here.
+    Query params: q (name contains), sector, year, sort (column, '-' prefix for
+    descending), page, per_page (max 100).
+    """
+    query = Disclosure.query
+    if request.args.get('q'):
+        query = query.filter(Disclosure.name.contains(request.args['q']))
+    if request.args.get('sector'):
+        query = query.filter_by(sector=request.args['sector'])
+    year = request.args.get('year', type=int)
+    if year:
+        query = query.filter_by(year=year)
+
+    sort = request.args.get('sort', 'name')
+    column_name = sort.lstrip('-')
+    if column_name not in Disclosure.SORTABLE:
+        return jsonify({'error': f'Cannot sort by {column_name}'}), 400
+    column = getattr(Disclosure, column_name)
+    order = column.desc() if sort.startswith('-') else column.asc()
+    query = query.order_by(order.nulls_last(), Disclosure.id)
+
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    result = query.paginate(page=page, per_page=per_page, error_out=False)
+    return jsonify({
+        'total': result.total,
+        'page': page,
+        'per_page': per_page,
+        'items': [row.to_dict() for row in result.items]
+    })
+
+@app.route('/metrics')
+def prometheus_metrics():
+    is_admin = current_user.is_authenticated and current_user.is_admin
+    if request.remote_addr not in app.config['METRICS_ALLOWED_IPS'] and not is_admin:
+        return Response('Not Found', status=404, mimetype='text/plain')
+    cache_counters = {f'detail_cache_{name}_total': value for name, value in DETAIL_CACHE.stats.items()}
+    cache_counters.update({f'user_cache_{name}_total': value for name, value in USER_CACHE.stats.items()})
+    labels = {'worker': os.getpid()} if SHARED_STORE is not None else None
+    return Response(metrics.render_prometheus(cache_counters, labels), mimetype='text/plain; version=0.0.4')
+
 @app.route('/home/fsiadmin')
 def admin_dashboard():
     if not current_user.is_authenticated:
@@ -138,6 +437,7 @@ def approve_user(user_id):
     if user:
         user.is_approved = True
         db.session.commit()
+        USER_CACHE.invalidate(user_id)
     
     return redirect(url_for('admin_dashboard'))
 
@@ -151,10 +451,15 @@ def reject_user(user_id):
     if user:
         db.session.delete(user)
         db.session.commit()
+        USER_CACHE.invalidate(user_id)
     
     return redirect(url_for('admin_dashboard'))
 
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+    # The reloader runs this file again in the child that serves (WERKZEUG_RUN_MAIN);
+    # start scraping there right away instead of waiting for the first request
+    if app.config['BACKGROUND_REFRESH'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_refresher()
     app.run(debug=True, port=5050, host='0.0.0.0')
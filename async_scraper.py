@@ -0,0 +1,68 @@
+# asyncio versions of scraper.fetch_company_list and scraper.fetch_company_detail
+# for callers running an event loop. The Flask app does not need them: its
+# routes only read what the background refresher has stored.
+import asyncio
+import httpx
+import metrics
+import scraper
+from http_client import DEFAULT_TIMEOUT
+
+# Connection pool shared by all requests made through one client
+CLIENT_LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+CLIENT_TIMEOUT = httpx.Timeout(DEFAULT_TIMEOUT[1], connect=DEFAULT_TIMEOUT[0])
+
+def make_client():
+    return httpx.AsyncClient(limits=CLIENT_LIMITS, timeout=CLIENT_TIMEOUT)
+
+async def _get(client, url, params=None):
+    # Tokens come from the shared scraper.CLIENT bucket, so async and threaded
+    # fetches together stay within one KISA rate limit
+    wait = scraper.CLIENT.bucket.reserve()
+    if wait:
+        await asyncio.sleep(wait)
+    metrics.increment('outbound_requests_total')
+    with metrics.timed('http_fetch'):
+        response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response
+
+async def fetch_company_list(max_pages=4, client=None, concurrency=4):
+    """
+    Async version of scraper.fetch_company_list.
+    Pages are fetched concurrently (at most `concurrency` in flight) over one
+    pooled client and returned in page order. Failed pages are printed and skipped.
+    """
+    if client is None:
+        async with make_client() as client:
+            return await fetch_company_list(max_pages, client, concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_page(page):
+        async with semaphore:
+            try:
+                print(f"Fetching page {page}...")
+                response = await _get(client, scraper.BASE_LIST_URL, params=scraper._list_params(page))
+                return scraper.parse_company_list(response.text)
+            except Exception as e:
+                print(f"Error fetching page {page}: {e}")
+                return []
+
+    pages = await asyncio.gather(*(fetch_page(page) for page in range(1, max_pages + 1)))
+    return [company for page in pages for company in page]
+
+async def fetch_company_detail(publish_no, client=None):
+    """
+    Async version of scraper.fetch_company_detail.
+    Returns the same dictionary, or None on failure.
+    """
+    if client is None:
+        async with make_client() as client:
+            return await fetch_company_detail(publish_no, client)
+
+    try:
+        response = await _get(client, scraper._detail_url(publish_no))
+        return scraper.parse_company_detail(response.text, publish_no)
+    except Exception as e:
+        print(f"Error fetching details for {publish_no}: {e}")
+        return None
@@ -0,0 +1,114 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+import compare_stats
+import scraper
+from fixtures import ReplayServer, detail_file, list_file, load_manifest
+
+
+def read_fixture(fixtures_dir, name, charset):
+    with open(os.path.join(fixtures_dir, name), 'rb') as f:
+        return f.read().decode(charset)
+
+def timings(fn, inputs, repeat):
+    """
+    Runs fn over every input `repeat` times; returns per-call seconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            started = time.perf_counter()
+            fn(item)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+def summarize(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        'calls': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'p50_ms': pick(0.50) * 1000,
+        'p99_ms': pick(0.99) * 1000,
+    }
+
+def bench_list_parse(list_pages, repeat):
+    samples = timings(scraper.parse_company_list, list_pages, repeat)
+    companies = sum(len(scraper.parse_company_list(html)) for html in list_pages)
+    result = summarize(samples)
+    result['pages_per_sec'] = len(samples) / sum(samples)
+    result['companies_per_sec'] = companies * repeat / sum(samples)
+    return result
+
+def bench_detail_parse(detail_pages, repeat):
+    return {
+        'bs4': summarize(timings(lambda html: scraper.parse_company_detail_bs4(html, ''), detail_pages, repeat)),
+        'lxml': summarize(timings(lambda html: scraper.parse_company_detail_lxml(html, ''), detail_pages, repeat)),
+    }
+
+def bench_extract_stats(detail_pages, repeat):
+    tables = [scraper.parse_company_detail(html, '')['table_html'] for html in detail_pages]
+    return summarize(timings(lambda table: compare_stats.extract_stats(table, ''), tables, repeat))
+
+def bench_compare_stats(fixtures_dir):
+    """
+    End-to-end compare_stats.main against the replay server, in a scratch
+    directory so the report files do not land in the working tree.
+    """
+    cwd = os.getcwd()
+    with ReplayServer(fixtures_dir), tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                compare_stats.main([])
+                wall = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+    return {'wall_s': wall}
+
+def run(fixtures_dir, repeat=20, end_to_end=True):
+    manifest = load_manifest(fixtures_dir)
+    charset = manifest['charset']
+    list_pages = [read_fixture(fixtures_dir, list_file(page), charset) for page in manifest['pages']]
+    detail_pages = [read_fixture(fixtures_dir, detail_file(no), charset) for no in manifest['details']]
+
+    results = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        # Hand-written stand-ins (the committed fixtures/) say nothing about real page timings
+        'fixtures': {'list_pages': len(list_pages), 'details': len(detail_pages),
+                     'synthetic': manifest.get('synthetic', False)},
+        'repeat': repeat,
+        'list_parse': bench_list_parse(list_pages, repeat) if list_pages else None,
+        'detail_parse': bench_detail_parse(detail_pages, repeat) if detail_pages else None,
+        'extract_stats': bench_extract_stats(detail_pages, repeat) if detail_pages else None,
+    }
+    if end_to_end:
+        results['compare_stats_main'] = bench_compare_stats(fixtures_dir)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks over recorded fixtures (see fixtures.py).")
+    parser.add_argument('--fixtures', default='fixtures')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--skip-end-to-end', action='store_true', help="Skip the compare_stats.main run")
+    parser.add_argument('--output', help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args.fixtures, args.repeat, not args.skip_end_to_end)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
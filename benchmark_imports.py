@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Entry points whose cold-start cost matters (web workers and CLI tools)
+MODULES = ['app', 'compare_stats', 'crawler', 'scraper', 'refresher', 'reports']
+# Dependencies that should only load on the code paths that need them
+HEAVY = ['pandas', 'numpy', 'bs4', 'reportlab', 'pyarrow']
+
+IMPORTTIME_LINE = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)')
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+wall = time.perf_counter() - started
+print(json.dumps([wall, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def measure(module):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    Returns (cumulative import microseconds, wall seconds, heavy modules loaded).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module, heavy=HEAVY)],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Top-level (unindented) entry for the module itself
+        if match and not match.group(2) and match.group(3) == module:
+            cumulative = int(match.group(1))
+    wall, heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return cumulative, wall, heavy
+
+def run(modules, repeat=5):
+    results = {}
+    for module in modules:
+        samples = [measure(module) for _ in range(repeat)]
+        cumulative = sorted(sample[0] for sample in samples)
+        wall = sorted(sample[1] for sample in samples)
+        results[module] = {
+            'import_ms_median': cumulative[len(cumulative) // 2] / 1000,
+            'wall_ms_median': wall[len(wall) // 2] * 1000,
+            'heavy_loaded': samples[-1][2],
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of the app and CLI modules (python -X importtime).")
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    text = json.dumps(run(args.modules, args.repeat), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import glob
+import os
+import timeit
+from fixtures import MANIFEST_FILE, detail_file, load_manifest
+from scraper import lxml_diverges, parse_company_detail_bs4, parse_company_detail_lxml
+
+def _detail_files(path):
+    """
+    (file, charset) for the detail pages in a directory: those listed in its
+    manifest.json (fixtures.py record), else every detail_*.html. List pages
+    recorded alongside them are not publishView pages and are skipped.
+    """
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        manifest = load_manifest(path)
+        return [(os.path.join(path, detail_file(no)), manifest['charset']) for no in manifest['details']]
+    return [(name, 'utf-8') for name in sorted(glob.glob(os.path.join(path, 'detail_*.html')))]
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        files = _detail_files(path) if os.path.isdir(path) else [(path, 'utf-8')]
+        for name, charset in files:
+            # Decoded from bytes: keeps "\r\n" exactly as it came off the wire
+            with open(name, 'rb') as f:
+                pages.append((name, f.read().decode(charset)))
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the bs4 and lxml detail parsers on saved publishView pages.")
+    parser.add_argument('paths', nargs='+', help="Saved .html pages or directories containing them")
+    parser.add_argument('--repeat', type=int, default=20, help="Parses per page and parser")
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        print("No pages found.")
+        return
+
+    mismatches = 0
+    fallbacks = 0
+    timed = 0
+    totals = {'bs4': 0.0, 'lxml': 0.0}
+    for name, html in pages:
+        if lxml_diverges(html):
+            # parse_company_detail sends these to bs4 even with DETAIL_PARSER = 'lxml'
+            fallbacks += 1
+            print(f"FALLBACK: {name}")
+        else:
+            try:
+                same = parse_company_detail_bs4(html, '') == parse_company_detail_lxml(html, '')
+            except Exception as e:
+                # A parser crashing on a page is a mismatch too; it is left out of the timings
+                mismatches += 1
+                print(f"MISMATCH: {name} ({type(e).__name__}: {e})")
+                continue
+            if not same:
+                mismatches += 1
+                print(f"MISMATCH: {name}")
+
+        timed += 1
+        for label, parse in (('bs4', parse_company_detail_bs4), ('lxml', parse_company_detail_lxml)):
+            totals[label] += timeit.timeit(lambda: parse(html, ''), number=args.repeat) / args.repeat
+
+    print(f"Pages: {len(pages)}, mismatches: {mismatches}, bs4 fallbacks: {fallbacks}")
+    if not timed:
+        return
+    for label, total in totals.items():
+        print(f"{label:5s} {total / timed * 1000:8.2f} ms/page")
+    print(f"Speedup: {totals['bs4'] / totals['lxml']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,26 @@
 
-import requests
-import re
-import pandas as pd
-from bs4 import BeautifulSoup
-from scraper import fetch_company_list, fetch_company_detail
+import argparse
+from scraper import fetch_company_list_concurrent, iter_company_details, stats_from_table_html
+from disclosure import DisclosureStats
+from reports import REPORT_COLUMNS, ReportWriter, SINKS, open_sinks
+from name_index import NameIndex
+from snapshots import SNAPSHOT_FILE, SnapshotDiff, SnapshotStore
+
+# Number of detail pages fetched in parallel
+DETAIL_CONCURRENCY = 4
+
+# Report format -> output file
+REPORT_FILES = {
+    'md': "latest_results.md",
+    'csv': "latest_results.csv",
+    'parquet': "latest_results.parquet",
+    'pdf': "financial_security_comparison.pdf",
+}
+DEFAULT_FORMATS = ('md', 'pdf')
+DIFF_FILE = "snapshot_diff.md"
 
 # Target companies
 
-
 TARGET_NAMES = [
     "(주)우리은행",
     "신한은행",
@@ -24,187 +37,140 @@ def clean_value(text):
         return "N/A"
     return text.strip()
 
-def format_personnel(text):
-    if not text or text == "N/A":
-        return text
-    # 1. Remove space before '명' if exists: "32.5 명" -> "32.5명"
-    # 2. Add space after '명' if not end of string: "32.5명외주" -> "32.5명 외주"
-    
-    # Regex sub: find (text)(number) -> (text) (number)
-    text = re.sub(r'([가-힣a-zA-Z])(\d)', r'\1 \2', text)
-    
-    # Matches a number (integer or float) followed by optional whitespace and '명'
-    text = re.sub(r'(\d+(?:\.\d+)?)\s*명', r'\1명 ', text)
-    
-    # Cleanup: If double spaces were created, collapse them.
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
-
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-
-def save_as_pdf(results, filename="comparison_report.pdf"):
-    try:
-        # Register Korean Font
-        # Try finding a standard Korean font on Mac
-        font_path = "/System/Library/Fonts/Supplemental/AppleGothic.ttf"
-        pdfmetrics.registerFont(TTFont('AppleGothic', font_path)) 
-        # Note: ttc files often contain multiply fonts. Index 0 is usually Regular or Bold.
-        
-        doc = SimpleDocTemplate(filename, pagesize=landscape(A4))
-        elements = []
-        
-        # Title
-        styles = getSampleStyleSheet()
-        # Create a custom style for Title with Korean support if needed, but standard might fail if not set.
-        # We'll use the Table mainly.
-        
-        data = [["Company", "IT Investment", "Security Investment", "IT Personnel", "Dedicated Personnel"]]
-        
-        for r in results:
-            data.append([
-                r['Company'],
-                r['IT Investment'],
-                r['Security Investment'],
-                r['IT Personnel'],
-                r['Security Personnel']
-            ])
-            
-        # Table Layout
-        # Calculate col widths roughly
-        col_widths = [100, 110, 110, 80, 250]
-        
-        t = Table(data, colWidths=col_widths)
-        t.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (-1,-1), 'AppleGothic'),
-            ('FONTSIZE', (0,0), (-1,-1), 8),
-            ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.black),
-            ('BACKGROUND', (0,0), (4,0), colors.lightgrey),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
-            ('WORDWRAP', (0,0), (-1,-1), True)
-        ]))
-        
-        elements.append(Paragraph("Financial Company Security Comparison", styles['Title']))
-        elements.append(t)
-        
-        doc.build(elements)
-        print(f"PDF saved to {filename}")
-        
-    except Exception as e:
-        print(f"Failed to save PDF: {e}")
-
 def extract_stats(html_content, company_name):
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    it_investment = "N/A"
-    sec_investment = "N/A"
-    it_personnel = "N/A"
-    sec_personnel = "N/A"
-    
-    cells = soup.find_all(['th', 'td'])
-    
-    for i, cell in enumerate(cells):
-        text = cell.get_text(strip=True)
-        
-        # IT Investment
-        if "정보기술부문 투자액" in text:
-            siblings = cell.find_next_siblings(['td'])
-            if siblings and len(siblings) > 0:
-                it_investment = siblings[-1].get_text(strip=True)
-
-        # Security Investment
-        if "정보보호부문 투자액" in text:
-            siblings = cell.find_next_siblings(['td'])
-            if siblings and len(siblings) > 0:
-                sec_investment = siblings[-1].get_text(strip=True)
-        
-        # IT Personnel
-        if "정보기술부문 인력" in text:
-             siblings = cell.find_next_siblings(['td'])
-             if siblings and len(siblings) > 0:
-                 it_personnel = format_personnel(siblings[-1].get_text(strip=True))
-
-        # Security Personnel
-        if "정보보호부문 전담인력" in text or "정보보호 전담인력" in text:
-             siblings = cell.find_next_siblings(['td'])
-             if siblings and len(siblings) > 0:
-                 sec_personnel = format_personnel(siblings[-1].get_text(strip=True))
-    
-    return it_investment, sec_investment, it_personnel, sec_personnel
-
-def main():
-    print(f"Fetch list (checking 10 pages)...")
-    all_companies = fetch_company_list(max_pages=10)
+    """
+    Display strings for an already-extracted status table (table_html).
+    Scraped details carry these in details['stats'] already; this is for saved HTML.
+    """
+    stats = stats_from_table_html(html_content)
+    return tuple(metric.display for metric in stats)
+
+def build_name_index(companies):
+    """
+    Maps stripped company name -> company dict. The first listing wins, same
+    as the old linear scan that stopped at the first match.
+    """
+    index = {}
+    for company in companies:
+        index.setdefault(company['name'].strip(), company)
+    return index
+
+def format_ratio(numerator, denominator):
+    if numerator is None or not denominator:
+        return "N/A"
+    return f"{numerator / denominator:.1%}"
+
+def placeholder_row(target, text):
+    row = {column: text for column in REPORT_COLUMNS}
+    row.update({"Company": target, "Security/IT Investment": "N/A", "Security/IT Personnel": "N/A"})
+    return row
+
+def stats_row(target, details):
+    """
+    Report row (reports.REPORT_COLUMNS) for one company. The ratios use the
+    numbers disclosure.build_stats already parsed (personnel totals included),
+    so each row is complete as soon as its page arrives.
+    """
+    if not (details and details.get('stats')):
+        return placeholder_row(target, "Error")
+    stats = DisclosureStats.from_row(details['stats'])
+    return {
+        "Company": target,
+        "IT Investment": stats.it_investment.display,
+        "Security Investment": stats.security_investment.display,
+        "IT Personnel": stats.it_personnel.display,
+        "Security Personnel": stats.security_personnel.display,
+        "Security/IT Investment": format_ratio(stats.security_investment.value, stats.it_investment.value),
+        "Security/IT Personnel": format_ratio(stats.security_personnel.value, stats.it_personnel.value),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Security disclosure comparison report.")
+    parser.add_argument('--pages', type=int, default=10, help="List pages to scan")
+    parser.add_argument('--all', action='store_true', help="Report every company in the list instead of TARGET_NAMES")
+    parser.add_argument('--formats', default=','.join(DEFAULT_FORMATS),
+                        help=f"Comma-separated outputs: {', '.join(SINKS)}")
+    parser.add_argument('--font', help="Korean TTF/TTC font for the PDF (default: $REPORT_FONT or a system font)")
+    parser.add_argument('--snapshot', default=SNAPSHOT_FILE,
+                        help="Content hashes and stats from the previous run; unchanged pages are not re-parsed")
+    args = parser.parse_args(argv)
+
+    print(f"Fetch list (checking {args.pages} pages)...")
+    all_companies, errors = fetch_company_list_concurrent(max_pages=args.pages)
+    for error in errors:
+        print(f"  Error fetching page {error['page']}: {error['error']}")
     
     print(f"Total companies found: {len(all_companies)}")
     
-    results = []
-    
-    for target in TARGET_NAMES:
-        print(f"Searching for: {target}")
-        found = False
-        for company in all_companies:
-            # Loose matching just in case of whitespace diffs
-            if company['name'].strip() == target.strip():
-                print(f"  Found! Fetching details (ID: {company['publish_no']})...")
-                details = fetch_company_detail(company['publish_no'])
-                if details and details.get('table_html'):
-                    it_inv, sec_inv, it_per, sec_per = extract_stats(details['table_html'], target)
-                    results.append({
-                        "Company": target,
-                        "IT Investment": it_inv,
-                        "Security Investment": sec_inv,
-                        "IT Personnel": it_per,
-                        "Security Personnel": sec_per
-                    })
-                else:
-                    results.append({
-                        "Company": target, 
-                        "IT Investment": "Error", 
-                        "Security Investment": "Error",
-                        "IT Personnel": "Error", 
-                        "Security Personnel": "Error"
-                    })
-                found = True
-                break
-        
-        if not found:
-            print(f"  Not found in list.")
-            results.append({
-                "Company": target, 
-                "IT Investment": "Not Found", 
-                "Security Investment": "Not Found",
-                "IT Personnel": "Not Found", 
-                "Security Personnel": "Not Found"
-            })
-
-
-    # Print Table
-    df = pd.DataFrame(results)
-    table_str = ""
-    try:
-        table_str = df.to_markdown(index=False)
-    except ImportError:
-        table_str = df.to_string(index=False)
-    
-    print("\n\n=== Comparison Table ===")
-    print(table_str)
-    
-    with open("latest_results.md", "w", encoding="utf-8") as f:
-        f.write(table_str)
-
-    print("\n\n=== Raw Results ===")
-    print(results)
-    
-    save_as_pdf(results, "financial_security_comparison.pdf")
+    suggestions = {}  # target -> closest listed name, for targets without an exact match
+    if args.all:
+        matches = build_name_index(all_companies)
+    else:
+        # Tolerates (주)/㈜/주식회사 and spacing differences between TARGET_NAMES and the listing.
+        # Only exact matches are reported: a fuzzy one may be another company entirely
+        # (한국투자증권 -> 한화투자증권), so it is only suggested.
+        name_index = NameIndex(all_companies)
+        matches = {target: name_index.get(target) for target in TARGET_NAMES}
+        for target, company in matches.items():
+            if company is None:
+                for key, score in name_index.fuzzy(target, limit=1):
+                    suggestions[target] = f"{name_index.get(key)['name']} ({score:.0%})"
+
+    # publish_no -> report names (two targets may resolve to the same disclosure)
+    targets = {}
+    for target, company in matches.items():
+        if company:
+            targets.setdefault(company['publish_no'], []).append(target)
+
+    store = SnapshotStore(args.snapshot)
+    diff = SnapshotDiff()
+
+    outputs = {fmt: REPORT_FILES.get(fmt, f"latest_results.{fmt}") for fmt in args.formats.split(',')}
+    print("\n=== Comparison Rows ===")
+    with ReportWriter(open_sinks(outputs, args.font)) as report:
+        # Rows are written in report order (TARGET_NAMES, or the listing with --all);
+        # a row that arrives early waits in `ready` until the rows before it are out
+        order = list(matches)
+        ready = {}
+        written = 0
+
+        def write_ready():
+            nonlocal written
+            while written < len(order) and order[written] in ready:
+                row = ready.pop(order[written])
+                print(f"  {' | '.join(row.values())}")
+                report.write(row)
+                written += 1
+
+        for target, company in matches.items():
+            if company is None:
+                hint = f" Did you mean {suggestions[target]}?" if target in suggestions else ""
+                print(f"  {target}: Not found in list.{hint}")
+                ready[target] = placeholder_row(target, "Not Found")
+        write_ready()
+
+        # Rows go to the sinks as soon as their turn comes, not after the slowest page
+        fetched = iter_company_details(list(targets), concurrency=DETAIL_CONCURRENCY, known_hashes=store.hashes())
+        for publish_no, item in fetched:
+            details = item['details']
+            if item['unchanged']:
+                # Same bytes as last run: reuse the stored stats, nothing was parsed
+                details = store.get(publish_no)
+                diff.mark_unchanged()
+            elif details is not None:
+                diff.record(details, store.put(details, item['content_hash']))
+            for target in targets[publish_no]:
+                if item['error']:
+                    print(f"  {target}: failed after {item['attempts']} attempts: {item['error']}")
+                ready[target] = stats_row(target, details)
+            write_ready()
+
+    store.save()
+    diff_report = diff.to_markdown()
+    print("\n=== Changes Since Last Run ===")
+    print(diff_report)
+    with open(DIFF_FILE, "w", encoding="utf-8") as f:
+        f.write(diff_report)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import scraper
+
+CHECKPOINT_FILE = "checkpoint.json"
+DETAILS_FILE = "details.jsonl"
+
+
+class CrawlCheckpoint:
+    """
+    Crawl progress per (sector, year), rewritten atomically after every step.
+    Each entry records the next list page, how many companies of that page are
+    done and the size of the details file at that point, so a resumed crawl
+    truncates any half-written line and continues exactly where it stopped.
+    Companies whose details could not be fetched are kept in failed() and
+    retried by the next run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    @staticmethod
+    def key(sector, year):
+        return f"{sector}|{year}"
+
+    def get(self, sector, year):
+        return self.state.get(self.key(sector, year), {'page': 1, 'item': 0, 'finished': False})
+
+    def offset(self):
+        return self.state.get('_offset', 0)
+
+    def failed(self):
+        """
+        [{'sector', 'year', 'publish_no', 'name', 'error'}] still to be retried.
+        Append to it before the next save() and it is written with that step.
+        """
+        return self.state.setdefault('_failed', [])
+
+    def save_failed(self, failed, offset):
+        self.state['_failed'] = failed
+        self.state['_offset'] = offset
+        self._write()
+
+    def save(self, sector, year, offset, **progress):
+        self.state[self.key(sector, year)] = progress
+        self.state['_offset'] = offset
+        self._write()
+
+    def _write(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def _write_record(out, sector, year, company, details):
+    record = {
+        'sector': sector,
+        'year': int(year),
+        'publish_no': company['publish_no'],
+        'name': company['name'],
+        'details': details,
+    }
+    out.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+    out.flush()
+
+def retry_failed(checkpoint, out, concurrency=4, retries=3, backoff=0.5):
+    """
+    Fetches the details that failed in earlier runs again. Successes are
+    appended to the details file; anything that fails again stays in the checkpoint.
+    """
+    failed = checkpoint.failed()
+    if not failed:
+        return
+    print(f"Retrying {len(failed)} disclosures that failed earlier...")
+    fetched = scraper.fetch_company_details([entry['publish_no'] for entry in failed], concurrency=concurrency,
+                                            retries=retries, backoff=backoff)
+    still_failed = []
+    for entry in failed:
+        item = fetched[entry['publish_no']]
+        if item['details'] is None:
+            still_failed.append(dict(entry, error=item['error']))
+        else:
+            _write_record(out, entry['sector'], entry['year'], entry, item['details'])
+    checkpoint.save_failed(still_failed, out.tell())
+
+def crawl(sectors, years, out_dir, concurrency=4, max_pages=None, retries=3, backoff=0.5):
+    """
+    Crawls every (sector, year) list and all of its disclosures, appending one
+    JSON line per disclosure to <out_dir>/details.jsonl. Only one list page
+    of companies is held in memory at a time. Safe to re-run after an
+    interruption: finished pages and companies are skipped, and disclosures
+    that failed after all retries are fetched again first.
+    List and detail pages get `retries` attempts on transient errors; a list
+    page that still fails ends the run, which the next run resumes from that page.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    checkpoint = CrawlCheckpoint(os.path.join(out_dir, CHECKPOINT_FILE))
+    details_path = os.path.join(out_dir, DETAILS_FILE)
+
+    with open(details_path, 'a+b') as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(checkpoint.offset())
+        out.seek(0, os.SEEK_END)
+        retry_failed(checkpoint, out, concurrency, retries, backoff)
+
+        for sector in sectors:
+            for year in years:
+                progress = checkpoint.get(sector, year)
+                page = progress['page']
+                skip = progress['item']
+                while not progress['finished']:
+                    print(f"[{sector} {year}] Fetching page {page}...")
+                    companies, last_page = scraper.fetch_list_page(page, sector, year, retries=retries,
+                                                                   backoff=backoff)
+                    last_page = last_page or page
+                    if max_pages:
+                        last_page = min(last_page, max_pages)
+
+                    pending = companies[skip:]
+                    fetched = scraper.fetch_company_details(
+                        [company['publish_no'] for company in pending],
+                        concurrency=concurrency,
+                        retries=retries,
+                        backoff=backoff
+                    )
+                    for done, company in enumerate(pending, start=skip + 1):
+                        item = fetched[company['publish_no']]
+                        if item['details'] is None:
+                            print(f"[{sector} {year}] {company['name']} failed: {item['error']}")
+                            checkpoint.failed().append({
+                                'sector': sector,
+                                'year': int(year),
+                                'publish_no': company['publish_no'],
+                                'name': company['name'],
+                                'error': item['error'],
+                            })
+                        else:
+                            _write_record(out, sector, year, company, item['details'])
+                        checkpoint.save(sector, year, out.tell(), page=page, item=done, finished=False)
+
+                    finished = not companies or page >= last_page
+                    progress = {'page': page + 1, 'item': 0, 'finished': finished}
+                    checkpoint.save(sector, year, out.tell(), **progress)
+                    page, skip = page + 1, 0
+
+    if checkpoint.failed():
+        print(f"{len(checkpoint.failed())} disclosures could not be fetched; run the crawl again to retry them")
+    return details_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable multi-sector, multi-year disclosure crawl.")
+    parser.add_argument('--sectors', nargs='+', default=[scraper.DEFAULT_SECTOR])
+    parser.add_argument('--years', nargs='+', default=[scraper.DEFAULT_YEAR])
+    parser.add_argument('--out', default='crawl')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--max-pages', type=int, default=None, help="Cap on list pages per sector and year")
+    args = parser.parse_args()
+
+    path = crawl(args.sectors, args.years, args.out, args.concurrency, args.max_pages)
+    print(f"Crawl complete: {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class DetailCache:
+    """
+    Two-tier cache for scraped company details.
+    Tier 1 is an in-process LRU (OrderedDict), tier 2 is a SQLite file so warm
+    entries survive restarts. Each entry has a TTL; once expired it is still
+    served for `stale_ttl` seconds, until the snapshot refresher stores a new one.
+    """
+
+    def __init__(self, db_path=None, max_entries=256, ttl=3600, stale_ttl=86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        # key -> (value, expires_at)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'disk_hits': 0}
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS detail_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _remember(self, key, value, expires_at):
+        # Caller must hold self._lock
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key):
+        """
+        Returns (value, expires_at, from_disk) from memory, falling back to SQLite.
+        Caller must hold self._lock.
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry[0], entry[1], False
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM detail_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                value = json.loads(row[0])
+                self._remember(key, value, row[1])
+                return value, row[1], True
+        return None, 0, False
+
+    def get(self, key, count=True):
+        """
+        Returns (value, is_fresh). Value is None on a miss or if the entry is
+        too stale to serve.
+        Lookups are counted in `stats` unless count=False (the refresher's own reads).
+        """
+        now = time.time()
+        with self._lock:
+            value, expires_at, from_disk = self._lookup(key)
+            if value is None or now > expires_at + self.stale_ttl:
+                if count:
+                    self.stats['misses'] += 1
+                return None, False
+            fresh = now <= expires_at
+            if count:
+                # Counted under the lock: threaded serving would otherwise lose updates
+                self.stats['hits' if fresh else 'stale_hits'] += 1
+                if from_disk:
+                    self.stats['disk_hits'] += 1
+            return value, fresh
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO detail_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at)
+                )
+                self._db.commit()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM detail_cache WHERE key = ?", (key,))
+                self._db.commit()
@@ -0,0 +1,105 @@
+import re
+from typing import NamedTuple, Optional, Union
+
+# Row labels in the status table -> DisclosureStats field
+STAT_LABELS = (
+    ('it_investment', ("정보기술부문 투자액",)),
+    ('security_investment', ("정보보호부문 투자액",)),
+    ('it_personnel', ("정보기술부문 인력",)),
+    ('security_personnel', ("정보보호부문 전담인력", "정보보호 전담인력")),
+)
+PERSONNEL_FIELDS = ('it_personnel', 'security_personnel')
+
+NUMBER_PATTERN = re.compile(r'\d[\d,]*(?:\.\d+)?')
+# Personnel cells may break the head count down:
+# "내부인력 32.5명 외주인력 41.3명 계 73.8명" (계/합계 = total)
+PERSONNEL_TOTAL_PATTERN = re.compile(r'계\s*:?\s*(\d[\d,]*(?:\.\d+)?)')
+PERSONNEL_COUNT_PATTERN = re.compile(r'(\d[\d,]*(?:\.\d+)?)\s*명')
+
+
+class Metric(NamedTuple):
+    """
+    One figure from the status table.
+    `value` is the parsed number (None if missing), `raw` the cell text as
+    published and `display` the text shown in reports.
+    """
+    value: Optional[Union[int, float]]
+    raw: str
+    display: str
+
+
+MISSING = Metric(None, "N/A", "N/A")
+
+
+class DisclosureStats(NamedTuple):
+    it_investment: Metric = MISSING
+    security_investment: Metric = MISSING
+    it_personnel: Metric = MISSING
+    security_personnel: Metric = MISSING
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Rebuilds the record from its JSON form (nested lists), as stored in caches.
+        """
+        return cls(*(Metric(*metric) for metric in row))
+
+    def to_dict(self):
+        return {field: metric._asdict() for field, metric in zip(self._fields, self)}
+
+
+def format_personnel(text):
+    if not text or text == "N/A":
+        return text
+    # 1. Remove space before '명' if exists: "32.5 명" -> "32.5명"
+    # 2. Add space after '명' if not end of string: "32.5명외주" -> "32.5명 외주"
+
+    # Regex sub: find (text)(number) -> (text) (number)
+    text = re.sub(r'([가-힣a-zA-Z])(\d)', r'\1 \2', text)
+
+    # Matches a number (integer or float) followed by optional whitespace and '명'
+    text = re.sub(r'(\d+(?:\.\d+)?)\s*명', r'\1명 ', text)
+
+    # Cleanup: If double spaces were created, collapse them.
+    text = re.sub(r'\s+', ' ', text)
+
+    return text.strip()
+
+def _to_number(text):
+    number = text.replace(',', '')
+    return float(number) if '.' in number else int(number)
+
+def parse_number(text):
+    """
+    First number in `text` ("359,567,117,043 원" -> 359567117043, "32.5 명" -> 32.5), or None.
+    """
+    match = NUMBER_PATTERN.search(text or "")
+    return _to_number(match.group(0)) if match else None
+
+def parse_personnel(text):
+    """
+    Total head count of a personnel cell, or None:
+    "내부인력 32.5명 외주인력 41.3명 계 73.8명" -> 73.8 (the 계 total),
+    "내부인력 32.5명 외주인력 10명" -> 42.5 (no total: the 명 figures added up),
+    "1,032.2 명" -> 1032.2.
+    """
+    text = text or ""
+    match = PERSONNEL_TOTAL_PATTERN.search(text)
+    if match:
+        return _to_number(match.group(1))
+    counts = [_to_number(count) for count in PERSONNEL_COUNT_PATTERN.findall(text)]
+    if len(counts) > 1:
+        return round(sum(counts), 2)
+    return parse_number(text)
+
+def build_stats(raw_values):
+    """
+    Builds DisclosureStats from {field: cell text} as found in the status table.
+    """
+    metrics = {}
+    for field, raw in raw_values.items():
+        if field in PERSONNEL_FIELDS:
+            metrics[field] = Metric(parse_personnel(raw), raw, format_personnel(raw))
+        else:
+            metrics[field] = Metric(parse_number(raw), raw, raw)
+    return DisclosureStats(**metrics)
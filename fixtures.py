@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import scraper
+from http_client import ScraperClient
+
+MANIFEST_FILE = "manifest.json"
+
+
+def list_file(page):
+    return f"list_{page}.html"
+
+def detail_file(publish_no):
+    return f"detail_{publish_no}.html"
+
+def record(out_dir, max_pages=4, publish_nos=None):
+    """
+    Saves live KISA responses for offline replay: list pages 1..max_pages and
+    the detail page of every company on them (or just `publish_nos`).
+    Requests go through scraper's shared client, so they keep its timeout and
+    KISA rate limit. Bodies are stored byte-for-byte; manifest.json keeps the charset.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {'charset': 'utf-8', 'pages': [], 'details': []}
+
+    def save(name, response):
+        response.raise_for_status()
+        manifest['charset'] = response.encoding or manifest['charset']
+        with open(os.path.join(out_dir, name), 'wb') as f:
+            f.write(response.content)
+
+    found = []
+    for page in range(1, max_pages + 1):
+        print(f"Recording page {page}...")
+        response = scraper._http_get(scraper.BASE_LIST_URL, params=scraper._list_params(page))
+        save(list_file(page), response)
+        manifest['pages'].append(page)
+        found.extend(company['publish_no'] for company in scraper.parse_company_list(response.text))
+
+    for publish_no in dict.fromkeys(publish_nos or found):
+        print(f"Recording details {publish_no}...")
+        save(detail_file(publish_no), scraper._http_get(scraper._detail_url(publish_no)))
+        manifest['details'].append(publish_no)
+
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+def load_manifest(fixtures_dir):
+    with open(os.path.join(fixtures_dir, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ReplayServer:
+    """
+    Local stand-in for isds.kisa.or.kr serving recorded fixtures.
+    Used as a context manager it points scraper's base URLs at itself and
+    swaps in an unthrottled scraper.CLIENT (the KISA rate limit would
+    otherwise dominate local timings), restoring both on exit:
+
+        with ReplayServer('fixtures'):
+            scraper.fetch_company_list(max_pages=4)
+
+    Unrecorded list pages come back empty (end of list), unrecorded details as 404.
+    `errors` makes fixtures fail: {'detail_3600.html': [503, 503]} answers the
+    first two requests for it with 503 and then serves it; a plain status
+    (`{'list_2.html': 500}`) fails every request.
+    """
+
+    def __init__(self, fixtures_dir, port=0, errors=None):
+        self.fixtures_dir = fixtures_dir
+        self.errors = dict(errors or {})
+        self._errors_lock = threading.Lock()
+        charset = load_manifest(fixtures_dir)['charset']
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path.endswith('list.do'):
+                    name = list_file(query.get('pageIndex', ['1'])[0])
+                    body = server._read(name) or b"<html><body></body></html>"
+                elif url.path.endswith('publishView.do'):
+                    name = detail_file(query.get('publishNo', [''])[0])
+                    body = server._read(name)
+                else:
+                    name = body = None
+                status = server._error_status(name)
+                if status:
+                    self.send_error(status)
+                    return
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', f'text/html; charset={charset}')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/kr/publish"
+        self._thread = None
+        self._saved = None
+
+    def _error_status(self, name):
+        with self._errors_lock:
+            statuses = self.errors.get(name)
+            if isinstance(statuses, list):
+                return statuses.pop(0) if statuses else None
+            return statuses
+
+    def _read(self, name):
+        path = os.path.join(self.fixtures_dir, os.path.basename(name))
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        self._saved = (scraper.BASE_LIST_URL, scraper.BASE_DETAIL_URL, scraper.CLIENT)
+        scraper.BASE_LIST_URL = f"{self.base_url}/list.do"
+        scraper.BASE_DETAIL_URL = f"{self.base_url}/publishView.do"
+        scraper.CLIENT = ScraperClient(rate=None)
+        return self
+
+    def __exit__(self, *exc):
+        scraper.CLIENT.close()
+        scraper.BASE_LIST_URL, scraper.BASE_DETAIL_URL, scraper.CLIENT = self._saved
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Record KISA responses or replay them on a local server.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    record_parser = subparsers.add_parser('record')
+    record_parser.add_argument('--out', default='fixtures')
+    record_parser.add_argument('--max-pages', type=int, default=4)
+    record_parser.add_argument('--publish-no', nargs='*', help="Only record these detail pages")
+    serve_parser = subparsers.add_parser('serve')
+    serve_parser.add_argument('--dir', default='fixtures')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        manifest = record(args.out, args.max_pages, args.publish_no)
+        print(f"Recorded {len(manifest['pages'])} list pages and {len(manifest['details'])} details")
+    else:
+        server = ReplayServer(args.dir, args.port)
+        print(f"Serving {args.dir} at {server.base_url}")
+        server.httpd.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Multi-process serving: gunicorn -c gunicorn.conf.py app:app
+# Every worker runs a refresher, but only the one holding the lease in the
+# shared store scrapes; the others read the published snapshot.
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5050')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+# Threaded workers: a request waiting on a password check (LOGIN_EXECUTOR) or a
+# slow client does not block the worker's other requests
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+# No preload_app: each worker must open its own SQLite connections after the fork
+
+os.makedirs('instance', exist_ok=True)
+os.environ.setdefault('SHARED_STORE', 'sqlite:///instance/shared.db')
+
+
+def post_fork(server, worker):
+    # The app starts its refresher with a worker's first request anyway;
+    # starting it here already warms workers that have not been hit yet
+    import app
+    app.start_refresher()
+
+
+def worker_exit(server, worker):
+    # Deploys, HUP and max-requests recycles: hand the refresh lease back so
+    # a new worker can take it now rather than once it expires
+    import app
+    app.REFRESHER.stop()
+    app.REFRESHER.release_lease()
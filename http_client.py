@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import requests
+from requests.adapters import HTTPAdapter
+import metrics
+
+DEFAULT_TIMEOUT = (5, 20)  # (connect, read) seconds
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts of up to `burst`.
+    acquire() blocks until a token is available; safe to share across threads.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes a token and returns how many seconds the caller must wait before
+        using it, for callers that cannot block (asyncio).
+        """
+        if not self.rate:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the token now (possibly going negative); the debt is waited off outside the lock
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+
+class ScraperClient:
+    """
+    Shared HTTP client for the KISA site.
+    - one keep-alive connection pool (requests.Session + HTTPAdapter)
+    - default timeouts on every request
+    - a token-bucket rate limit shared by every caller
+    - conditional GET: ETag/Last-Modified are remembered per URL and a 304
+      answer returns the previously received response
+    - concurrent GETs of the same URL are coalesced into one upstream request
+    """
+
+    def __init__(self, rate=5.0, burst=5, pool_size=16, timeout=DEFAULT_TIMEOUT, max_validators=256):
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.max_validators = max_validators
+        self._validators = OrderedDict()  # url -> (headers, response)
+        self._inflight = {}               # url -> Future
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        """
+        GET `url`; returns a requests.Response which may be shared with other
+        callers, so treat it as read-only.
+        """
+        url = requests.Request('GET', url, params=params).prepare().url
+        with self._lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = self._inflight[url] = Future()
+        if not leader:
+            metrics.increment('coalesced_requests_total')
+            return future.result()
+
+        try:
+            response = self._fetch(url, timeout or self.timeout)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
+
+    def _fetch(self, url, timeout):
+        with self._lock:
+            cached = self._validators.get(url)
+        headers = dict(cached[0]) if cached else {}
+
+        self.bucket.acquire()
+        metrics.increment('outbound_requests_total')
+        with metrics.timed('http_fetch'):
+            response = self.session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and cached:
+            metrics.increment('conditional_get_total', result='not_modified')
+            with self._lock:
+                self._validators.move_to_end(url)
+            return cached[1]
+
+        if response.ok:
+            validators = {}
+            if response.headers.get('ETag'):
+                validators['If-None-Match'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validators['If-Modified-Since'] = response.headers['Last-Modified']
+            if validators:
+                metrics.increment('conditional_get_total', result='modified')
+                with self._lock:
+                    self._validators[url] = (validators, response)
+                    self._validators.move_to_end(url)
+                    while len(self._validators) > self.max_validators:
+                        self._validators.popitem(last=False)
+        return response
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Latency samples kept per stage for the p50/p99 estimates
+SAMPLE_WINDOW = 2048
+QUANTILES = (0.5, 0.9, 0.99)
+
+_lock = threading.Lock()
+_stages = {}    # stage -> {'count': n, 'sum': seconds, 'samples': deque}
+_counters = {}  # (name, labels) -> value
+
+# Per-request (stage, seconds) list while a Server-Timing collection is active
+_request_timings = ContextVar('request_timings', default=None)
+
+
+def observe(stage, seconds):
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = {'count': 0, 'sum': 0.0, 'samples': deque(maxlen=SAMPLE_WINDOW)}
+        entry['count'] += 1
+        entry['sum'] += seconds
+        entry['samples'].append(seconds)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+@contextmanager
+def timed(stage):
+    """
+    Times the block as one observation of `stage`:
+
+        with metrics.timed('http_fetch'):
+            response = requests.get(url)
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started)
+
+def increment(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def start_request_timing():
+    """
+    Starts collecting stage timings for the current request; returns a token for stop_request_timing.
+    """
+    return _request_timings.set([])
+
+def stop_request_timing(token):
+    timings = _request_timings.get() or []
+    _request_timings.reset(token)
+    return timings
+
+def server_timing_header(timings):
+    """
+    Server-Timing value, summing repeated stages: "html_parse;dur=1.20, table_cleanup;dur=0.40"
+    """
+    totals = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ', '.join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in totals.items())
+
+def _quantile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+def render_prometheus(extra_counters=None, labels=None):
+    """
+    Prometheus text exposition of all stage summaries and counters.
+    `extra_counters` ({name: value}) is for counters kept elsewhere, e.g. cache stats.
+    `labels` ({name: value}) are added to every series, e.g. the worker pid
+    when several processes each keep their own figures.
+    """
+    with _lock:
+        stages = {stage: (entry['count'], entry['sum'], sorted(entry['samples'])) for stage, entry in _stages.items()}
+        counters = dict(_counters)
+    common = tuple(sorted((key, str(value)) for key, value in (labels or {}).items()))
+
+    lines = ['# TYPE stage_duration_seconds summary']
+    for stage, (count, total, ordered) in sorted(stages.items()):
+        stage_labels = common + (('stage', stage),)
+        for q in QUANTILES:
+            lines.append(f'stage_duration_seconds{_format_labels(stage_labels + (("quantile", q),))} '
+                         f'{_quantile(ordered, q):.6f}')
+        lines.append(f'stage_duration_seconds_sum{_format_labels(stage_labels)} {total:.6f}')
+        lines.append(f'stage_duration_seconds_count{_format_labels(stage_labels)} {count}')
+
+    for name, value in (extra_counters or {}).items():
+        counters[(name, ())] = value
+    seen = set()
+    for (name, counter_labels), value in sorted(counters.items()):
+        if name not in seen:
+            lines.append(f'# TYPE {name} counter')
+            seen.add(name)
+        lines.append(f'{name}{_format_labels(common + counter_labels)} {value}')
+    return '\n'.join(lines) + '\n'
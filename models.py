@@ -1,6 +1,33 @@
+import json
+from datetime import datetime
 from extensions import db
+from disclosure import DisclosureStats
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+import metrics
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+
+def normalize_hash_method(method):
+    """
+    Spells out werkzeug's default iteration count: 'pbkdf2:sha256' -> 'pbkdf2:sha256:1000000',
+    so it compares equal to the prefix stored in password_hash.
+    """
+    if method.startswith('pbkdf2:') and method.count(':') == 1:
+        return f"{method}:{DEFAULT_PBKDF2_ITERATIONS}"
+    if method == 'scrypt':
+        return 'scrypt:32768:8:1'
+    return method
+
+def hash_password(password, method):
+    with metrics.timed('password_hash'):
+        return generate_password_hash(password, method=method)
+
+def verify_password_hash(password_hash, password):
+    """
+    Plain function of the stored hash so it can run on a worker thread
+    without touching the ORM instance.
+    """
+    with metrics.timed('password_verify'):
+        return check_password_hash(password_hash, password)
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -9,8 +36,86 @@ class User(UserMixin, db.Model):
     is_approved = db.Column(db.Boolean, default=False)
     is_admin = db.Column(db.Boolean, default=False)
 
+    # werkzeug hash method for new and rehashed passwords; app.py sets it from PASSWORD_HASH_METHOD
+    HASH_METHOD = 'pbkdf2:sha256'
+    # Columns kept by the user_loader cache
+    CACHED_COLUMNS = ('id', 'username', 'is_approved', 'is_admin')
+
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = hash_password(password, self.HASH_METHOD)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password_hash(self.password_hash, password)
+
+    def needs_rehash(self):
+        """
+        True if the stored hash was made with other parameters than HASH_METHOD.
+        """
+        stored_method = self.password_hash.split('$', 1)[0]
+        return stored_method != normalize_hash_method(self.HASH_METHOD)
+
+    def cache_columns(self):
+        return {column: getattr(self, column) for column in self.CACHED_COLUMNS}
+
+
+class Disclosure(db.Model):
+    """
+    Parsed security disclosure of one company for one publish year.
+    Numeric columns are indexed so cross-company rankings never touch KISA.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    publish_no = db.Column(db.String(20), nullable=False)
+    year = db.Column(db.Integer, nullable=False, index=True)
+    name = db.Column(db.String(200), nullable=False, index=True)
+    sector = db.Column(db.String(100), nullable=False, index=True)
+    it_investment = db.Column(db.BigInteger, index=True)
+    security_investment = db.Column(db.BigInteger, index=True)
+    it_personnel = db.Column(db.Float, index=True)
+    security_personnel = db.Column(db.Float, index=True)
+    security_investment_ratio = db.Column(db.Float, index=True)
+    # Full DisclosureStats (raw and display text) as stored in the detail cache
+    stats_json = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('publish_no', 'year', name='uq_disclosure_publish_year'),)
+
+    # Columns /api/companies may sort on
+    SORTABLE = ('name', 'year', 'it_investment', 'security_investment', 'it_personnel',
+                'security_personnel', 'security_investment_ratio')
+
+    @classmethod
+    def upsert(cls, details, year, sector):
+        """
+        Inserts or updates the row for a scraped details dict. Caller commits.
+        """
+        stats = DisclosureStats.from_row(details['stats'])
+        row = cls.query.filter_by(publish_no=details['publish_no'], year=year).first()
+        if row is None:
+            row = cls(publish_no=details['publish_no'], year=year)
+            db.session.add(row)
+        row.name = details['name']
+        row.sector = sector
+        row.it_investment = stats.it_investment.value
+        row.security_investment = stats.security_investment.value
+        row.it_personnel = stats.it_personnel.value
+        row.security_personnel = stats.security_personnel.value
+        if stats.it_investment.value and stats.security_investment.value is not None:
+            row.security_investment_ratio = stats.security_investment.value / stats.it_investment.value
+        else:
+            row.security_investment_ratio = None
+        row.stats_json = json.dumps(stats.to_dict(), ensure_ascii=False)
+        return row
+
+    def to_dict(self):
+        return {
+            'publish_no': self.publish_no,
+            'year': self.year,
+            'name': self.name,
+            'sector': self.sector,
+            'it_investment': self.it_investment,
+            'security_investment': self.security_investment,
+            'it_personnel': self.it_personnel,
+            'security_personnel': self.security_personnel,
+            'security_investment_ratio': self.security_investment_ratio,
+            'stats': json.loads(self.stats_json) if self.stats_json else None
+        }
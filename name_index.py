@@ -0,0 +1,138 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from difflib import SequenceMatcher
+
+# Corporate forms dropped before comparing names. NFKC already turns ㈜ into (주).
+CORPORATE_SUFFIXES = re.compile(r'\(주\)|\(株\)|주식회사|\(유\)|유한회사')
+NON_WORD = re.compile(r'[\s()\[\]·.,&-]+')
+
+# Minimum similarity (0-1) for a fuzzy match to count in lookup()
+FUZZY_CUTOFF = 0.75
+
+
+def normalize_name(name):
+    """
+    Comparable form of a company name:
+    "(주) 국민은행" / "국민은행" / "토스뱅크㈜" -> "국민은행" / "국민은행" / "토스뱅크"
+    """
+    name = unicodedata.normalize('NFKC', name or '')
+    name = CORPORATE_SUFFIXES.sub('', name)
+    return NON_WORD.sub('', name).lower()
+
+def _grams(key):
+    # Bigrams with boundary markers, so one-character names still get two grams
+    padded = f'^{key}$'
+    return [padded[i:i + 2] for i in range(len(padded) - 1)]
+
+
+class NameIndex:
+    """
+    In-memory index over company dicts (scraper.fetch_company_list output).
+    Names are normalized once; lookups use a dict (exact), a sorted key list
+    (prefix) and a bigram inverted index (substring and fuzzy candidates),
+    so nothing scans every company.
+    """
+
+    def __init__(self, companies):
+        self.companies = list(companies)
+        self._by_key = {}   # normalized name -> [company index, ...] in listing order
+        self._postings = {}  # bigram -> set of normalized names
+        for i, company in enumerate(self.companies):
+            key = normalize_name(company['name'])
+            if key not in self._by_key:
+                self._by_key[key] = []
+                for gram in _grams(key):
+                    self._postings.setdefault(gram, set()).add(key)
+            self._by_key[key].append(i)
+        self._keys = sorted(self._by_key)
+
+    def __len__(self):
+        return len(self.companies)
+
+    def _first(self, key):
+        return self.companies[self._by_key[key][0]]
+
+    def get(self, name):
+        """
+        Company whose normalized name equals that of `name` (first listing wins), or None.
+        """
+        key = normalize_name(name)
+        return self._first(key) if key in self._by_key else None
+
+    def prefix(self, text, limit=20):
+        key = normalize_name(text)
+        start = bisect_left(self._keys, key)
+        keys = []
+        for candidate in self._keys[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            keys.append(candidate)
+        return keys
+
+    def _candidates(self, key):
+        """
+        Normalized names sharing bigrams with `key`, most shared first.
+        """
+        counts = Counter()
+        for gram in set(_grams(key)):
+            counts.update(self._postings.get(gram, ()))
+        return counts
+
+    def fuzzy(self, text, limit=5, cutoff=FUZZY_CUTOFF):
+        """
+        [(normalized name, similarity)] for the closest names, best first.
+        Only names sharing at least one bigram are scored. Ties go to the name
+        sharing more bigrams, then to the alphabetically first one, so results
+        do not depend on set order.
+        """
+        key = normalize_name(text)
+        grams = len(set(_grams(key)))
+        candidates = heapq.nsmallest(max(limit * 3, 10), self._candidates(key).items(),
+                                     key=lambda item: (-item[1], item[0]))
+        scored = []
+        for candidate, shared in candidates:
+            # Cheap bigram (Dice) pre-filter before the slower difflib ratio
+            if 2 * shared / (grams + len(set(_grams(candidate)))) < cutoff / 2:
+                continue
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= cutoff:
+                scored.append((-score, -shared, candidate))
+        scored.sort()
+        return [(candidate, -score) for score, _, candidate in scored[:limit]]
+
+    def search(self, query, limit=20):
+        """
+        Companies for a search box, best first: exact, prefix, then substring
+        matches. Only if none of those match, fuzzy matches (FUZZY_CUTOFF) for
+        typos. Every listing of a matched name is returned.
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        ranked = []
+        if key in self._by_key:
+            ranked.append(key)
+        ranked.extend(self.prefix(key, limit))
+        # Substring: every bigram of the query (without boundaries) must be shared
+        inner = [key[i:i + 2] for i in range(len(key) - 1)] or [key]
+        if len(key) == 1:
+            candidates = {c for gram, names in self._postings.items() if key in gram for c in names}
+        else:
+            candidates = set.intersection(*(self._postings.get(gram, set()) for gram in inner))
+        # Shortest names first: the query covers more of them
+        ranked.extend(heapq.nsmallest(limit, (c for c in candidates if key in c), key=lambda c: (len(c), c)))
+        # Fuzzy only as a fallback: short names sharing just a suffix such as
+        # 은행 would otherwise pad an exact hit with unrelated companies
+        if not ranked:
+            ranked.extend(candidate for candidate, _ in self.fuzzy(key, limit))
+
+        results = []
+        for candidate in dict.fromkeys(ranked):
+            results.extend(self.companies[i] for i in self._by_key[candidate])
+            if len(results) >= limit:
+                break
+        return results[:limit]
@@ -0,0 +1,92 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+class Payload(NamedTuple):
+    """
+    One API response serialized once: identity, gzip and (if available) brotli bodies.
+    `etag` tags the identity body; see representation_etag for the others.
+    """
+    etag: str
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes]
+
+
+def build_payload(text):
+    body = text.encode('utf-8')
+    # Strong ETag (unquoted) of the identity body: identical bytes <=> identical tag
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    return Payload(
+        etag=etag,
+        body=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11) if brotli else None
+    )
+
+def pick_encoding(payload, accept_encodings):
+    """
+    Returns (content_encoding or None, bytes) for the best encoding the client accepts.
+    `accept_encodings` is werkzeug's request.accept_encodings.
+    """
+    if payload.br is not None and accept_encodings['br']:
+        return 'br', payload.br
+    if accept_encodings['gzip']:
+        return 'gzip', payload.gzip
+    return None, payload.body
+
+def representation_etag(payload, encoding):
+    """
+    Strong ETag of one encoding of `payload`: each content-coding is its own
+    representation, so gzip and br bodies get '<hash>-gzip' / '<hash>-br'.
+    """
+    return payload.etag if encoding is None else f"{payload.etag}-{encoding}"
+
+def representation_etags(payload):
+    """
+    The ETags of every encoding `payload` can be served in.
+    """
+    encodings = [None, 'gzip'] + (['br'] if payload.br is not None else [])
+    return [representation_etag(payload, encoding) for encoding in encodings]
+
+
+class PayloadCache:
+    """
+    LRU of prebuilt Payloads keyed like the detail cache. Entries are
+    replaced whenever the refresher stores new details for a key.
+    `version` is whatever the payload was built from (a content hash);
+    get() misses when the caller expects a different one.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, payload, version=None):
+        with self._lock:
+            self._entries[key] = (payload, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,215 @@
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+from collections import namedtuple
+import scraper
+
+# Immutable view of the last successful scrape. Readers grab `refresher.snapshot`
+# once and never see a half-updated list.
+Snapshot = namedtuple('Snapshot', ['companies', 'content_hashes', 'refreshed_at'])
+
+EMPTY_SNAPSHOT = Snapshot(companies=[], content_hashes={}, refreshed_at=None)
+
+
+class SnapshotRefresher:
+    """
+    Background scheduler that scrapes the company list and every company's
+    detail, fills the detail cache and swaps in a new Snapshot.
+    Runs once at start() and then every `interval` seconds.
+    Detail pages whose content hash has not changed are not re-parsed; their
+    cached entry is just re-stored so it does not expire.
+    `on_details`, if given, is called with the list of new or changed details.
+
+    With a shared `store` (see shared_store.py) several worker processes each
+    run a refresher, but only the holder of the refresh lease scrapes; the
+    snapshot is published to the store and every worker reads it from there.
+    The lease is short (`lease_ttl`) and renewed by a heartbeat thread while
+    held, so a crashed leader is replaced quickly; a worker that exits cleanly
+    hands it back through release_lease().
+
+    With `templates` (table_store.TableTemplates) details are cached in their
+    compact form, without the full table_html.
+
+    With `snapshot_path` (single process) each snapshot is also written to a
+    JSON file and loaded back on startup, so a restarted app serves the last
+    list immediately and only scrapes once that snapshot is `interval` old.
+    """
+
+    LEASE = 'refresher'
+    SNAPSHOT_KEY = 'snapshot'
+    VERSION_KEY = 'snapshot_version'
+
+    def __init__(self, detail_cache, max_pages=4, interval=3600, concurrency=4, on_details=None, store=None,
+                 templates=None, snapshot_path=None, lease_ttl=60):
+        self.detail_cache = detail_cache
+        self.templates = templates
+        self.max_pages = max_pages
+        self.interval = interval
+        self.concurrency = concurrency
+        self.on_details = on_details
+        self.store = store
+        # A leader that stops renewing (crashed worker) is replaced after this
+        self.lease_ttl = lease_ttl
+        self._leading = False
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+        self.snapshot_path = snapshot_path
+        self._snapshot = self._load_snapshot()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def snapshot(self):
+        if self.store is None:
+            return self._snapshot
+        # One small read per access; the full snapshot is only reloaded when
+        # the leader has published a new one
+        version = self.store.get(self.VERSION_KEY)
+        if version != self._snapshot.refreshed_at:
+            data = self.store.get(self.SNAPSHOT_KEY)
+            if data is not None:
+                self._snapshot = Snapshot(**data)
+        return self._snapshot
+
+    @snapshot.setter
+    def snapshot(self, snapshot):
+        if self.store is not None:
+            self.store.set(self.SNAPSHOT_KEY, snapshot._asdict())
+            self.store.set(self.VERSION_KEY, snapshot.refreshed_at)
+        elif self.snapshot_path:
+            tmp_path = self.snapshot_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot._asdict(), f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        self._snapshot = snapshot
+
+    def _load_snapshot(self):
+        if self.store is None and self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding='utf-8') as f:
+                    return Snapshot(**json.load(f))
+            except (ValueError, TypeError) as e:
+                print(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+        return EMPTY_SNAPSHOT
+
+    def refresh_once(self):
+        started = time.time()
+        companies, errors = scraper.fetch_company_list_concurrent(
+            max_pages=self.max_pages, concurrency=self.concurrency
+        )
+        for error in errors:
+            print(f"Error fetching page {error['page']}: {error['error']}")
+        if not companies:
+            print("Refresh returned no companies, keeping previous snapshot")
+            return self.snapshot
+
+        previous = self.snapshot.content_hashes
+        cached = {}
+        known_hashes = {}
+        for company in companies:
+            publish_no = company['publish_no']
+            # Not a client lookup: kept out of the cache hit/miss counters
+            value, _ = self.detail_cache.get(publish_no, count=False)
+            if value is not None and publish_no in previous:
+                cached[publish_no] = value
+                known_hashes[publish_no] = previous[publish_no]
+
+        fetched = scraper.fetch_company_details(
+            [company['publish_no'] for company in companies],
+            concurrency=self.concurrency,
+            known_hashes=known_hashes
+        )
+
+        content_hashes = {}
+        changed = []
+        for publish_no, item in fetched.items():
+            if item['unchanged']:
+                self.detail_cache.set(publish_no, cached[publish_no])
+            elif item['details'] is not None:
+                details = item['details']
+                if self.templates is not None:
+                    details = self.templates.compact_details(details)
+                self.detail_cache.set(publish_no, details)
+                changed.append(item['details'])
+            else:
+                print(f"Error fetching details for {publish_no}: {item['error']}")
+                # Keep the old hash so a later run can still skip it
+                if publish_no in previous:
+                    content_hashes[publish_no] = previous[publish_no]
+                continue
+            content_hashes[publish_no] = item['content_hash']
+
+        if changed and self.on_details is not None:
+            self.on_details(changed)
+
+        self.snapshot = Snapshot(companies, content_hashes, time.time())
+        print(f"Refreshed {len(companies)} companies ({len(changed)} changed) in {time.time() - started:.1f}s")
+        return self.snapshot
+
+    def is_leader(self):
+        """
+        True if this refresher should scrape: always without a shared store,
+        otherwise only while it holds (and has just renewed) the lease.
+        """
+        if self.store is None:
+            return True
+        self._leading = self.store.acquire_lease(self.LEASE, self.owner, self.lease_ttl)
+        return self._leading
+
+    def release_lease(self):
+        """
+        Hands the refresh lease back so another worker can take it at once.
+        Called when the process exits: the refresher thread is a daemon and
+        never gets to release it itself.
+        """
+        if self.store is not None and self._leading:
+            self._leading = False
+            self.store.release_lease(self.LEASE, self.owner)
+
+    def _heartbeat(self):
+        # Renews the lease while held, also during a refresh longer than lease_ttl
+        while not self._stop.wait(self.lease_ttl / 3):
+            if self._leading and not self.store.acquire_lease(self.LEASE, self.owner, self.lease_ttl):
+                self._leading = False
+                print("Lost the refresh lease")
+
+    def _run(self):
+        while not self._stop.is_set():
+            # A persisted snapshot (file, shared store or another worker's) is served as is until it is due
+            refreshed_at = self.snapshot.refreshed_at
+            due_in = 0 if refreshed_at is None else refreshed_at + self.interval - time.time()
+            if due_in > 0:
+                self._stop.wait(due_in)
+                continue
+            leader = False
+            try:
+                leader = self.is_leader()
+                if leader:
+                    self.refresh_once()
+            except Exception as e:
+                print(f"Refresh failed: {e}")
+            # Followers look again once a dead leader's lease could have expired
+            self._stop.wait(self.interval if leader else self.lease_ttl)
+        self.release_lease()
+
+    @property
+    def started(self):
+        return self._thread is not None
+
+    def start(self):
+        """
+        Starts the background thread; further calls, from any thread, do nothing.
+        """
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='snapshot-refresher', daemon=True)
+                self._thread.start()
+                if self.store is not None:
+                    threading.Thread(target=self._heartbeat, name='refresh-lease', daemon=True).start()
+                    atexit.register(self.release_lease)
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,281 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+import queue
+import threading
+
+# reportlab and pyarrow are imported by the sinks that need them, so a
+# Markdown/CSV run never loads either
+
+REPORT_COLUMNS = (
+    "Company",
+    "IT Investment",
+    "Security Investment",
+    "IT Personnel",
+    "Security Personnel",
+    "Security/IT Investment",
+    "Security/IT Personnel",
+)
+
+# Korean fonts tried in order when REPORT_FONT is not set. (path, subfont index for .ttc)
+FONT_CANDIDATES = (
+    ("/usr/share/fonts/truetype/nanum/NanumGothic.ttf", 0),
+    ("/usr/share/fonts/nanum/NanumGothic.ttf", 0),
+    ("/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc", 1),
+    ("/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc", 1),
+    ("/usr/share/fonts/google-noto-cjk/NotoSansCJK-Regular.ttc", 1),
+    ("/usr/share/fonts/truetype/unfonts-core/UnDotum.ttf", 0),
+    ("/System/Library/Fonts/Supplemental/AppleGothic.ttf", 0),
+    ("C:/Windows/Fonts/malgun.ttf", 0),
+)
+# Built into reportlab (no font file needed); the PDF viewer supplies the glyphs
+FALLBACK_CID_FONT = "HYGothic-Medium"
+
+# Sinks close on their own ReportWriter threads; without the lock their
+# messages can land on one line
+_print_lock = threading.Lock()
+
+
+def report_print(message):
+    with _print_lock:
+        print(message, flush=True)
+
+
+def find_font(path=None):
+    """
+    Registers a Korean font with reportlab and returns its name.
+    Uses `path`, else $REPORT_FONT, else the first of FONT_CANDIDATES that
+    exists, else reportlab's built-in CID font, so this works on headless
+    Linux hosts with no fonts installed.
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    path = path or os.environ.get("REPORT_FONT")
+    candidates = [(path, 0)] if path else FONT_CANDIDATES
+    for font_path, index in candidates:
+        if not os.path.exists(font_path):
+            continue
+        name = os.path.splitext(os.path.basename(font_path))[0]
+        try:
+            pdfmetrics.registerFont(TTFont(name, font_path, subfontIndex=index))
+            return name
+        except Exception as e:
+            print(f"Could not load font {font_path}: {e}")
+    pdfmetrics.registerFont(UnicodeCIDFont(FALLBACK_CID_FONT))
+    return FALLBACK_CID_FONT
+
+
+class Sink(ABC):
+    """
+    Report output. write() gets one row dict (REPORT_COLUMNS) at a time as
+    results arrive; close() finishes the file.
+    """
+
+    @abstractmethod
+    def write(self, row):
+        ...
+
+    @abstractmethod
+    def close(self):
+        ...
+
+
+class MarkdownSink(Sink):
+    def __init__(self, filename, columns=REPORT_COLUMNS):
+        self.filename = filename
+        self.columns = columns
+        self.file = open(filename, "w", encoding="utf-8")
+        self.file.write("| " + " | ".join(columns) + " |\n")
+        self.file.write("|" + "|".join(":---" for _ in columns) + "|\n")
+        self.file.flush()
+
+    def write(self, row):
+        cells = (str(row.get(column, "")).replace("|", "\\|") for column in self.columns)
+        self.file.write("| " + " | ".join(cells) + " |\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        report_print(f"Markdown saved to {self.filename}")
+
+
+class CsvSink(Sink):
+    def __init__(self, filename, columns=REPORT_COLUMNS):
+        self.filename = filename
+        # utf-8-sig so Excel opens the Korean text correctly
+        self.file = open(filename, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction="ignore")
+        self.writer.writeheader()
+        self.file.flush()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+        report_print(f"CSV saved to {self.filename}")
+
+
+class ParquetSink(Sink):
+    """
+    Writes a row group every `batch_size` rows. Needs pyarrow.
+    """
+
+    def __init__(self, filename, columns=REPORT_COLUMNS, batch_size=100):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:  # optional: no Parquet output
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.filename = filename
+        self.columns = columns
+        self.batch_size = batch_size
+        self.schema = pa.schema([(column, pa.string()) for column in columns])
+        self.writer = pq.ParquetWriter(filename, self.schema)
+        self.batch = []
+
+    def write(self, row):
+        self.batch.append(row)
+        if len(self.batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.batch:
+            columns = {column: [str(row.get(column, "")) for row in self.batch] for column in self.columns}
+            self.writer.write_table(self.pa.table(columns, schema=self.schema))
+            self.batch = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+        report_print(f"Parquet saved to {self.filename}")
+
+
+class PdfSink(Sink):
+    """
+    PDF table. reportlab lays out the whole document at once, so rows are
+    collected and the file is built on close().
+    """
+
+    def __init__(self, filename, columns=REPORT_COLUMNS, font=None, title="Financial Company Security Comparison"):
+        self.filename = filename
+        self.columns = columns
+        self.font = font or find_font()
+        self.title = title
+        self.rows = []
+
+    def write(self, row):
+        self.rows.append([str(row.get(column, "")) for column in self.columns])
+
+    def close(self):
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+        doc = SimpleDocTemplate(self.filename, pagesize=landscape(A4))
+        styles = getSampleStyleSheet()
+
+        # Company, money x2, personnel, dedicated personnel breakdown, ratios
+        col_widths = [100, 100, 100, 70, 200, 60, 60][:len(self.columns)]
+        # repeatRows keeps the header on every page for long sector-wide reports
+        table = Table([list(self.columns)] + self.rows, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            ('FONTNAME', (0, 0), (-1, -1), self.font),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ]))
+        doc.build([Paragraph(self.title, styles['Title']), table])
+        report_print(f"PDF saved to {self.filename}")
+
+
+SINKS = {
+    'md': MarkdownSink,
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+    'pdf': PdfSink,
+}
+
+
+class ReportWriter:
+    """
+    Fans rows out to several sinks, each written on its own thread from its
+    own queue, so a slow sink (PDF layout, Parquet encoding) never holds up
+    the others or the producer. A sink that fails is reported and dropped.
+
+        with ReportWriter([MarkdownSink("out.md"), CsvSink("out.csv")]) as report:
+            for row in rows:
+                report.write(row)
+    """
+
+    def __init__(self, sinks):
+        self.workers = []
+        for sink in sinks:
+            rows = queue.Queue()
+            thread = threading.Thread(target=self._drain, args=(sink, rows), daemon=True)
+            thread.start()
+            self.workers.append((rows, thread))
+
+    @staticmethod
+    def _drain(sink, rows):
+        failed = False
+        while True:
+            row = rows.get()
+            if row is None:
+                break
+            if failed:
+                continue
+            try:
+                sink.write(row)
+            except Exception as e:
+                report_print(f"{type(sink).__name__} failed: {e}")
+                failed = True
+        if not failed:
+            try:
+                sink.close()
+            except Exception as e:
+                report_print(f"{type(sink).__name__} failed: {e}")
+
+    def write(self, row):
+        for rows, _ in self.workers:
+            rows.put(row)
+
+    def close(self):
+        for rows, _ in self.workers:
+            rows.put(None)
+        for _, thread in self.workers:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_sinks(outputs, font=None):
+    """
+    Builds sinks from {format: filename}, e.g. {'md': 'latest_results.md'}.
+    Formats whose dependencies are missing are reported and skipped.
+    """
+    sinks = []
+    for fmt, filename in outputs.items():
+        if fmt not in SINKS:
+            print(f"Unknown report format: {fmt}")
+            continue
+        try:
+            if fmt == 'pdf':
+                sinks.append(PdfSink(filename, font=font))
+            else:
+                sinks.append(SINKS[fmt](filename))
+        except Exception as e:
+            print(f"Skipping {fmt} report: {e}")
+    return sinks
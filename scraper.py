@@ -1,15 +1,126 @@
+# BeautifulSoup is imported inside the functions that use it (list pages and
+# the reference detail parser), so importing this module stays cheap
+import lxml.html
 import requests
-import pandas as pd
-from bs4 import BeautifulSoup
+import metrics
+from http_client import DEFAULT_TIMEOUT, ScraperClient, TokenBucket
+from disclosure import DisclosureStats, STAT_LABELS, build_stats
+import os
 import time
 from urllib.parse import parse_qs, urlparse
 import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Base URL for the list
 BASE_LIST_URL = "https://isds.kisa.or.kr/kr/publish/list.do"
 # Base URL for the detail view
 BASE_DETAIL_URL = "https://isds.kisa.or.kr/kr/publish/publishView.do"
 
+# Sector (searchWrd) and year (searchPublishYear) scraped by default
+DEFAULT_SECTOR = "금융 및 보험업"
+DEFAULT_YEAR = '2025'
+
+# Pooled, rate-limited client shared by every fetch in the process
+CLIENT = ScraperClient()
+
+def _http_get(url, session=None, **kwargs):
+    """
+    GET through the shared CLIENT, or through `session` if a caller passes its own.
+    """
+    if session is None:
+        return CLIENT.get(url, **kwargs)
+    metrics.increment('outbound_requests_total')
+    with metrics.timed('http_fetch'):
+        return session.get(url, timeout=DEFAULT_TIMEOUT, **kwargs)
+
+def _list_params(page, search_keyword=DEFAULT_SECTOR, publish_year=DEFAULT_YEAR):
+    return {
+        'menuNo': '204942',
+        'pageIndex': page,
+        'publishNo': '',
+        'listFlag': 'list',
+        'searchCnd': '',
+        'searchWrd': search_keyword,
+        'searchPublishYear': publish_year,
+        'searchDutyYn': '',
+        'searchPublishModYn': ''
+    }
+
+def parse_company_list(html):
+    """
+    Parses one list page.
+    Returns a list of dictionaries: [{'name': '...', 'publish_no': '...', 'link': '...'}, ...]
+    """
+    from bs4 import BeautifulSoup
+    company_list = []
+    with metrics.timed('html_parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+    links = soup.select(".m_title a")
+
+    for link in links:
+        href = link.get('href')
+        # Structural Company Name Extraction
+        # User requirement: Extract text located strictly between <a> tag and <img> tag (before img).
+        title = ""
+        for item in link.contents:
+            if item.name == 'img':
+                break
+            if isinstance(item, str):
+                title += item
+
+        title = title.strip()
+        if not title:
+            # Fallback if no text found via structure, use get_text
+             title = link.get_text(strip=True)
+
+        # Extract publishNo from href using regex
+        match = re.search(r'publishNo=(\d+)', href)
+        if not match:
+            match = re.search(r'\d{4}', href)
+
+        if match:
+            publish_no = match.group(1) if len(match.groups()) > 0 else match.group(0)
+
+            if publish_no:
+                company_list.append({
+                    'name': title,
+                    'publish_no': publish_no,
+                    'link': f"{BASE_DETAIL_URL}?menuNo=204942&pageIndex=1&publishNo={publish_no}"
+                })
+    return company_list
+
+# Pagination links look like "pageIndex=12" or "fn_egov_link_page(12)" (eGovFrame)
+PAGE_LINK_PATTERN = re.compile(r'(?:pageIndex=|link_?[pP]age\()(\d+)')
+
+def parse_last_page(html):
+    """
+    Returns the highest page number linked from a list page, or None if the
+    page has no recognisable pagination.
+    """
+    pages = [int(n) for n in PAGE_LINK_PATTERN.findall(html)]
+    return max(pages) if pages else None
+
+def fetch_list_page(page, sector=DEFAULT_SECTOR, year=DEFAULT_YEAR, session=None, retries=1, backoff=0.5):
+    """
+    Fetches one list page for a sector (searchWrd) and publish year.
+    Returns (company_list, last_page); last_page is None if the page has no pagination.
+    Connection errors, timeouts and 5xx/429 responses are tried up to `retries`
+    times in all with exponential backoff, as in fetch_company_details.
+    Raises on other HTTP errors and once the attempts run out.
+    """
+    if retries < 1:
+        raise ValueError(f"retries must be at least 1 (one attempt), got {retries}")
+    for attempt in range(1, retries + 1):
+        try:
+            response = _http_get(BASE_LIST_URL, session, params=_list_params(page, sector, str(year)))
+            response.raise_for_status()
+            return parse_company_list(response.text), parse_last_page(response.text)
+        except Exception as e:
+            if not _is_transient(e) or attempt == retries:
+                raise
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
 def fetch_company_list(max_pages=4):
     """
     Fetches the list of companies from the first `max_pages`.
@@ -17,144 +128,493 @@ def fetch_company_list(max_pages=4):
     """
     company_list = []
     
-    # query parameters based on user's URL 
-    search_keyword = "금융 및 보험업"
-    
     for page in range(1, max_pages + 1):
-        params = {
-            'menuNo': '204942',
-            'pageIndex': page,
-            'publishNo': '',
-            'listFlag': 'list',
-            'searchCnd': '',
-            'searchWrd': search_keyword,
-            'searchPublishYear': '2025',
-            'searchDutyYn': '',
-            'searchPublishModYn': ''
-        }
-        
         try:
             print(f"Fetching page {page}...")
-            response = requests.get(BASE_LIST_URL, params=params)
+            response = _http_get(BASE_LIST_URL, params=_list_params(page))
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.select(".m_title a")
-            
-            for link in links:
-                href = link.get('href')
-                # Structural Company Name Extraction
-                # User requirement: Extract text located strictly between <a> tag and <img> tag (before img).
-                title = ""
-                for item in link.contents:
-                    if item.name == 'img':
-                        break
-                    if isinstance(item, str):
-                        title += item
-                
-                title = title.strip()
-                if not title:
-                    # Fallback if no text found via structure, use get_text
-                     title = link.get_text(strip=True)
-
-                # Extract publishNo from href using regex
-                match = re.search(r'publishNo=(\d+)', href)
-                if not match:
-                    match = re.search(r'\d{4}', href)
-                
-                if match:
-                    publish_no = match.group(1) if len(match.groups()) > 0 else match.group(0)
-                    
-                    if publish_no:
-                        company_list.append({
-                            'name': title,
-                            'publish_no': publish_no,
-                            'link': f"{BASE_DETAIL_URL}?menuNo=204942&pageIndex=1&publishNo={publish_no}"
-                        })
+            company_list.extend(parse_company_list(response.text))
         except Exception as e:
             print(f"Error fetching page {page}: {e}")
             
     return company_list
 
+def fetch_company_list_concurrent(max_pages=None, concurrency=4, session=None):
+    """
+    Fetches list pages in parallel on a bounded thread pool through the shared CLIENT
+    (or `session`).
+    If `max_pages` is None the last page is read from page 1's pagination.
+    Returns (company_list, errors); company_list is in page order exactly like
+    fetch_company_list, errors is a list of {'page': n, 'error': '...'} for failed pages.
+    """
+    def fetch_page(page):
+        response = _http_get(BASE_LIST_URL, session, params=_list_params(page))
+        response.raise_for_status()
+        return response.text
+
+    pages = {}
+    errors = []
+    if max_pages is None:
+        # Page 1 is needed up front to discover how many pages there are
+        try:
+            first_html = fetch_page(1)
+        except Exception as e:
+            return [], [{'page': 1, 'error': str(e)}]
+        pages[1] = parse_company_list(first_html)
+        max_pages = parse_last_page(first_html) or 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(fetch_page, page): page
+            for page in range(1, max_pages + 1) if page not in pages
+        }
+        for future in as_completed(futures):
+            page = futures[future]
+            try:
+                pages[page] = parse_company_list(future.result())
+            except Exception as e:
+                errors.append({'page': page, 'error': str(e)})
+
+    company_list = []
+    for page in sorted(pages):
+        company_list.extend(pages[page])
+    errors.sort(key=lambda err: err['page'])
+    return company_list, errors
+
+def _raw_stats_bs4(table):
+    """
+    Finds the status-table figures: for each labelled cell, the text of the
+    last <td> after it in the same row.
+    """
+    raw_values = {}
+    for cell in table.find_all(['th', 'td']):
+        text = cell.get_text(strip=True)
+        for field, labels in STAT_LABELS:
+            if any(label in text for label in labels):
+                siblings = cell.find_next_siblings(['td'])
+                if siblings:
+                    raw_values[field] = siblings[-1].get_text(strip=True)
+    return raw_values
+
+def parse_company_detail_bs4(html, publish_no):
+    """
+    Parses a publishView page with BeautifulSoup (reference implementation).
+    Returns a dictionary with 'name', 'publish_no', 'table_html' and 'stats' (DisclosureStats).
+    """
+    from bs4 import BeautifulSoup
+    with metrics.timed('html_parse'):
+        soup = BeautifulSoup(html, 'html.parser')
+    
+    # 1. Extract Company Name
+    company_name = "Unknown"
+    
+    # Method: Look in the first table (Corporate Info) for "기업명"
+    tables = soup.find_all('table')
+    if tables:
+        corp_info_table = tables[0]
+        for row in corp_info_table.find_all('tr'):
+            # Check both th and td for "기업명" key
+            cells = row.find_all(['th', 'td'])
+            for i, cell in enumerate(cells):
+                if "기업명" in cell.get_text():
+                    # The value should be in the next cell
+                    if i + 1 < len(cells):
+                        company_name = cells[i+1].get_text(strip=True)
+                    break
+            if company_name != "Unknown":
+                break
+    
+    # 2. Extract "Information Security Status" Table
+    target_table_html = "<p class='error-text'>정보보호 현황 테이블을 찾을 수 없습니다.</p>"
+    stats = DisclosureStats()
+    keywords = ["정보보호 투자 현황", "정보보호 인력 현황", "정보보호 현황"] 
+    # Added "정보보호 현황" as a broad fallback if the table header itself says it.
+    # But strictly, the request listed "1. 정보보호 투자 현황" etc which are likely Row Headers in the table.
+    
+    for table in tables:
+        table_text = table.get_text()
+        # Check if likely the big status table
+        if "정보보호 투자 현황" in table_text or "정보보호 인력 현황" in table_text:
+            cleanup_started = time.perf_counter()
+            # Cleanup: Remove "도움말" (Help) and "닫기" (Close) buttons/links
+            # Cleanup: Remove "도움말" (Help) and "닫기" (Close) buttons/links
+            for bad_text in ["도움말", "닫기"]:
+                # 1. Find elements that directy contain the text
+                # We look for any tag that contains the text
+                for element in table.find_all(string=re.compile(bad_text)):
+                     # Traverse up to find a container (a, button, span, or even div if it looks like a button)
+                     parent = element.parent
+                     while parent and parent.name not in ['table', 'body', 'html', 'tr']:
+                         # If it's a clickable-like element or a span wrapper often used for buttons
+                         if parent.name in ['a', 'button', 'span', 'div']:
+                             # Double check if removing this parent removes the bad text
+                             if bad_text in parent.get_text():
+                                 parent.decompose()
+                                 break
+                         parent = parent.parent
+                
+                # 2. Also look for images with alt text
+                for img in table.find_all('img', alt=re.compile(bad_text)):
+                    img.decompose()
+
+            if table.get('class'):
+                table['class'].append('extracted-table')
+            else:
+                table['class'] = ['extracted-table']
+            target_table_html = str(table)
+            metrics.observe('table_cleanup', time.perf_counter() - cleanup_started)
+            stats = build_stats(_raw_stats_bs4(table))
+            break
+    
+    return {
+        'name': company_name,
+        'publish_no': publish_no,
+        'table_html': target_table_html,
+        'stats': stats
+    }
+
+# --- Fast path: lxml ---------------------------------------------------------
+# parse_company_detail_lxml returns exactly what parse_company_detail_bs4 returns
+# for well-formed pages (run benchmark_parser.py to check saved pages). It parses
+# with libxml2 and replays BeautifulSoup's html.parser conventions itself:
+# whitespace-only strings collapse to "\n" or " ", attributes are sorted,
+# multi-valued attributes are re-joined, void tags end in "/>", and & < > are escaped.
+
+# libxml2 turns "\r\n" into "\n"; html.parser keeps it. Hide "\r" while parsing.
+CR_PLACEHOLDER = '\ue000'
+ASCII_SPACES = ' \n\t\x0c\r'
+BS4_VOID_TAGS = {
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr',
+    'image', 'img', 'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid',
+    'param', 'source', 'spacer', 'track', 'wbr'
+}
+BS4_LIST_ATTRIBUTES = {
+    '*': {'class', 'accesskey', 'dropzone'},
+    'a': {'rel', 'rev'}, 'link': {'rel', 'rev'}, 'area': {'rel'},
+    'td': {'headers'}, 'th': {'headers'}, 'form': {'accept-charset'},
+    'object': {'archive'}, 'icon': {'sizes'}, 'iframe': {'sandbox'}, 'output': {'for'}
+}
+BS4_RAW_TEXT_TAGS = {'script', 'style'}
+CLEANUP_CONTAINERS = {'a', 'button', 'span', 'div'}
+CLEANUP_STOP_TAGS = {'table', 'body', 'html', 'tr'}
+BAD_TEXTS = ("도움말", "닫기")
+
+def _is_element(node):
+    # Comments and processing instructions have a function as their tag
+    return isinstance(node.tag, str)
+
+def _bs4_string(text, parent):
+    """
+    Restores "\r" and applies html.parser's whitespace-only string collapse.
+    """
+    text = text.replace(CR_PLACEHOLDER, '\r')
+    if text.strip(ASCII_SPACES):
+        return text
+    for node in parent.iterancestors():
+        if node.tag in ('pre', 'textarea'):
+            return text
+    if parent.tag in ('pre', 'textarea'):
+        return text
+    return '\n' if '\n' in text else ' '
+
+def _strings(el):
+    """
+    Yields the text strings under `el` like Tag._all_strings (no comments, scripts or styles).
+    """
+    if el.tag not in BS4_RAW_TEXT_TAGS and el.text:
+        yield el.text
+    for child in el:
+        if _is_element(child):
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+def _stripped_text(el):
+    # Equivalent of get_text(strip=True)
+    return ''.join(
+        text for text in (s.replace(CR_PLACEHOLDER, '\r').strip() for s in _strings(el)) if text
+    )
+
+def _cleanup_target(parent):
+    """
+    Nearest button-like ancestor of a string whose parent is `parent`,
+    mirroring the parent walk in parse_company_detail_bs4.
+    """
+    while parent is not None and parent.tag not in CLEANUP_STOP_TAGS:
+        if parent.tag in CLEANUP_CONTAINERS:
+            return parent
+        parent = parent.getparent()
+    return None
+
+def _normalize_and_find_cleanup(table):
+    """
+    Single walk over the status table: normalizes every string the way
+    html.parser would have stored it and collects the elements to remove.
+    """
+    targets = []
+    for node in table.iter():
+        if _is_element(node):
+            if node.text:
+                if node.tag not in BS4_RAW_TEXT_TAGS:
+                    node.text = _bs4_string(node.text, node)
+                if any(bad in node.text for bad in BAD_TEXTS):
+                    targets.append(_cleanup_target(node))
+            if node.tag == 'img':
+                alt = node.get('alt') or ''
+                if any(bad in alt for bad in BAD_TEXTS):
+                    targets.append(node)
+        elif node.text and any(bad in node.text for bad in BAD_TEXTS):
+            # Comment text is a string too as far as find_all(string=...) is concerned
+            targets.append(_cleanup_target(node.getparent()))
+
+        if node is not table and node.tail:
+            parent = node.getparent()
+            node.tail = _bs4_string(node.tail, parent)
+            if any(bad in node.tail for bad in BAD_TEXTS):
+                targets.append(_cleanup_target(parent))
+    # A container holding several bad strings is collected once per string
+    return [target for target in dict.fromkeys(targets) if target is not None]
+
+def _bs4_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def _bs4_attribute(tag, key, value):
+    if key in BS4_LIST_ATTRIBUTES['*'] or key in BS4_LIST_ATTRIBUTES.get(tag, ()):
+        value = ' '.join(value.split())
+    value = _bs4_escape(value.replace(CR_PLACEHOLDER, '\r'))
+    if '"' in value:
+        if "'" in value:
+            return f'{key}="{value.replace(chr(34), "&quot;")}"'
+        return f"{key}='{value}'"
+    return f'{key}="{value}"'
+
+def _bs4_html(el, out):
+    """
+    Serializes `el` into the list `out` the way str(tag) does in BeautifulSoup.
+    """
+    tag = el.tag
+    attributes = ''.join(' ' + _bs4_attribute(tag, key, value) for key, value in sorted(el.attrib.items()))
+    if tag in BS4_VOID_TAGS and el.text is None and len(el) == 0:
+        out.append(f'<{tag}{attributes}/>')
+        return
+    out.append(f'<{tag}{attributes}>')
+    raw = tag in BS4_RAW_TEXT_TAGS
+    if el.text:
+        out.append(el.text if raw else _bs4_escape(el.text))
+    for child in el:
+        if _is_element(child):
+            _bs4_html(child, out)
+        elif isinstance(child, lxml.html.HtmlComment):
+            out.append(f'<!--{child.text}-->')
+        if child.tail:
+            out.append(_bs4_escape(child.tail))
+    out.append(f'</{tag}>')
+
+def _raw_stats_lxml(table):
+    # Same lookup as _raw_stats_bs4
+    raw_values = {}
+    for cell in table.iter('th', 'td'):
+        text = _stripped_text(cell)
+        for field, labels in STAT_LABELS:
+            if any(label in text for label in labels):
+                siblings = [sibling for sibling in cell.itersiblings() if sibling.tag == 'td']
+                if siblings:
+                    raw_values[field] = _stripped_text(siblings[-1])
+    return raw_values
+
+def parse_company_detail_lxml(html, publish_no):
+    """
+    Same result as parse_company_detail_bs4, built on lxml.
+    Company name lookup, status table detection and button stripping share
+    one walk over the tables instead of several find_all passes.
+    """
+    with metrics.timed('html_parse'):
+        root = lxml.html.document_fromstring(html.replace('\r', CR_PLACEHOLDER))
+    tables = list(root.iter('table'))
+
+    # 1. Extract Company Name from the first table
+    company_name = "Unknown"
+    if tables:
+        for row in tables[0].iter('tr'):
+            cells = list(row.iter('th', 'td'))
+            for i, cell in enumerate(cells):
+                if "기업명" in cell.text_content():
+                    if i + 1 < len(cells):
+                        company_name = _stripped_text(cells[i + 1])
+                    break
+            if company_name != "Unknown":
+                break
+
+    # 2. Extract "Information Security Status" Table
+    target_table_html = "<p class='error-text'>정보보호 현황 테이블을 찾을 수 없습니다.</p>"
+    stats = DisclosureStats()
+    for table in tables:
+        # text_content() is a cheap C-level prefilter; the exact check below
+        # uses the collapsed strings html.parser would have produced
+        if "정보보호" not in table.text_content():
+            continue
+        table_text = ''.join(_bs4_string(text, table) for text in _strings(table))
+        if "정보보호 투자 현황" in table_text or "정보보호 인력 현황" in table_text:
+            cleanup_started = time.perf_counter()
+            for target in _normalize_and_find_cleanup(table):
+                # Already gone with an enclosing target (or the table root itself)
+                if target.getparent() is not None:
+                    target.drop_tree()
+
+            classes = (table.get('class') or '').split()
+            table.set('class', ' '.join(classes + ['extracted-table']))
+            out = []
+            _bs4_html(table, out)
+            target_table_html = ''.join(out).replace(CR_PLACEHOLDER, '\r')
+            metrics.observe('table_cleanup', time.perf_counter() - cleanup_started)
+            stats = build_stats(_raw_stats_lxml(table))
+            break
+
+    return {
+        'name': company_name,
+        'publish_no': publish_no,
+        'table_html': target_table_html,
+        'stats': stats
+    }
+
+def stats_from_table_html(table_html):
+    """
+    DisclosureStats for an already-extracted status table (a 'table_html' value).
+    """
+    table = lxml.html.document_fromstring(table_html.replace('\r', CR_PLACEHOLDER)).find('.//table')
+    if table is None:
+        return DisclosureStats()
+    return build_stats(_raw_stats_lxml(table))
+
+# Markup that lxml and html.parser build different trees for, so the lxml path
+# cannot reproduce the bs4 result and the page goes to the bs4 parser instead:
+# - boolean attributes written without a value (<td nowrap>): libxml2 stores
+#   nowrap="nowrap", html.parser nowrap=""
+# - elements with an optional end tag left open (<td>, <tr>, <p>, <li>, ...):
+#   libxml2 closes them where a browser would, html.parser nests everything
+#   up to the parent's end tag inside them (different table_html, and for
+#   cells different stats)
+BOOLEAN_ATTRIBUTE_PATTERN = re.compile(
+    r'<[a-zA-Z][^<>]*\s(?:checked|compact|declare|defer|disabled|ismap|multiple|nohref|noresize|noshade|nowrap|readonly|selected)'
+    r'(?=[\s/>])(?!\s*=)', re.IGNORECASE)
+OPTIONAL_END_TAG_PATTERN = re.compile(
+    r'<(/?)(p|li|dt|dd|td|th|tr|thead|tbody|tfoot|option|optgroup|colgroup)(?=[\s/>])', re.IGNORECASE)
+
+def lxml_diverges(html):
+    """
+    True if `html` contains markup parse_company_detail_lxml handles differently from bs4.
+    """
+    if BOOLEAN_ATTRIBUTE_PATTERN.search(html):
+        return True
+    balance = {}
+    for closing, tag in OPTIONAL_END_TAG_PATTERN.findall(html):
+        tag = tag.lower()
+        balance[tag] = balance.get(tag, 0) + (-1 if closing else 1)
+    return any(balance.values())
+
+# Parser used by every fetch function: 'bs4' (reference) or 'lxml' (fast path,
+# falling back to bs4 for pages lxml_diverges() flags). The lxml path has only
+# been checked against the synthetic pages in fixtures/, so it stays off until
+# benchmark_parser.py reports no mismatches on pages recorded from KISA with
+# `python fixtures.py record --out <dir>`; DETAIL_PARSER=lxml turns it on meanwhile.
+DETAIL_PARSER = os.environ.get('DETAIL_PARSER', 'bs4')
+# Part of every content hash: bump it when parsing changes so pages stored
+# under an older parse (known_hashes in caches and snapshots) are parsed again
+PARSE_VERSION = 3
+
+def parse_company_detail(html, publish_no):
+    """
+    Parses a publishView page with the parser selected by DETAIL_PARSER.
+    Returns a dictionary with 'name', 'publish_no', 'table_html' and 'stats' (DisclosureStats).
+    """
+    if DETAIL_PARSER == 'lxml' and not lxml_diverges(html):
+        return parse_company_detail_lxml(html, publish_no)
+    return parse_company_detail_bs4(html, publish_no)
+
+def _detail_url(publish_no):
+    return f"{BASE_DETAIL_URL}?menuNo=204942&pageIndex=1&publishNo={publish_no}"
+
 def fetch_company_detail(publish_no):
     """
     Fetches the details for a specific company by publish_no.
     Returns a dictionary with 'name' and 'html_table'.
     """
-    url = f"{BASE_DETAIL_URL}?menuNo=204942&pageIndex=1&publishNo={publish_no}"
-    
     try:
-        response = requests.get(url)
+        response = _http_get(_detail_url(publish_no))
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 1. Extract Company Name
-        company_name = "Unknown"
-        
-        # Method: Look in the first table (Corporate Info) for "기업명"
-        tables = soup.find_all('table')
-        if tables:
-            corp_info_table = tables[0]
-            for row in corp_info_table.find_all('tr'):
-                # Check both th and td for "기업명" key
-                cells = row.find_all(['th', 'td'])
-                for i, cell in enumerate(cells):
-                    if "기업명" in cell.get_text():
-                        # The value should be in the next cell
-                        if i + 1 < len(cells):
-                            company_name = cells[i+1].get_text(strip=True)
-                        break
-                if company_name != "Unknown":
-                    break
-        
-        # 2. Extract "Information Security Status" Table
-        target_table_html = "<p class='error-text'>정보보호 현황 테이블을 찾을 수 없습니다.</p>"
-        keywords = ["정보보호 투자 현황", "정보보호 인력 현황", "정보보호 현황"] 
-        # Added "정보보호 현황" as a broad fallback if the table header itself says it.
-        # But strictly, the request listed "1. 정보보호 투자 현황" etc which are likely Row Headers in the table.
-        
-        for table in tables:
-            table_text = table.get_text()
-            # Check if likely the big status table
-            if "정보보호 투자 현황" in table_text or "정보보호 인력 현황" in table_text:
-                # Cleanup: Remove "도움말" (Help) and "닫기" (Close) buttons/links
-                # Cleanup: Remove "도움말" (Help) and "닫기" (Close) buttons/links
-                for bad_text in ["도움말", "닫기"]:
-                    # 1. Find elements that directy contain the text
-                    # We look for any tag that contains the text
-                    for element in table.find_all(string=re.compile(bad_text)):
-                         # Traverse up to find a container (a, button, span, or even div if it looks like a button)
-                         parent = element.parent
-                         while parent and parent.name not in ['table', 'body', 'html', 'tr']:
-                             # If it's a clickable-like element or a span wrapper often used for buttons
-                             if parent.name in ['a', 'button', 'span', 'div']:
-                                 # Double check if removing this parent removes the bad text
-                                 if bad_text in parent.get_text():
-                                     parent.decompose()
-                                     break
-                             parent = parent.parent
-                    
-                    # 2. Also look for images with alt text
-                    for img in table.find_all('img', alt=re.compile(bad_text)):
-                        img.decompose()
-
-                if table.get('class'):
-                    table['class'].append('extracted-table')
-                else:
-                    table['class'] = ['extracted-table']
-                target_table_html = str(table)
-                break
-        
-        return {
-            'name': company_name,
-            'publish_no': publish_no,
-            'table_html': target_table_html
-        }
-
+        return parse_company_detail(response.text, publish_no)
     except Exception as e:
         print(f"Error fetching details for {publish_no}: {e}")
         return None
 
+# HTTP statuses worth another attempt; any other error status is permanent
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def _is_transient(error):
+    """
+    True for failures a retry can fix: connection errors, timeouts and 5xx/429.
+    """
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRY_STATUSES
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+def iter_company_details(publish_nos, concurrency=4, rate=None, retries=3, backoff=0.5, session=None,
+                         known_hashes=None):
+    """
+    Streaming form of fetch_company_details: yields (publish_no, result) as
+    each fetch finishes, in completion order, so callers can start on the
+    first results while slow pages are still in flight.
+    """
+    if retries < 1:
+        raise ValueError(f"retries must be at least 1 (one attempt), got {retries}")
+    known_hashes = known_hashes or {}
+    limiter = TokenBucket(rate)
+
+    def fetch_one(publish_no):
+        error = None
+        for attempt in range(1, retries + 1):
+            limiter.acquire()
+            try:
+                response = _http_get(_detail_url(publish_no), session)
+                response.raise_for_status()
+                content_hash = hashlib.sha256(f'{PARSE_VERSION}:'.encode() + response.content).hexdigest()
+                if known_hashes.get(publish_no) == content_hash:
+                    return {'details': None, 'error': None, 'attempts': attempt,
+                            'content_hash': content_hash, 'unchanged': True}
+                details = parse_company_detail(response.text, publish_no)
+                return {'details': details, 'error': None, 'attempts': attempt,
+                        'content_hash': content_hash, 'unchanged': False}
+            except Exception as e:
+                error = str(e)
+                if not _is_transient(e) or attempt == retries:
+                    break
+                time.sleep(backoff * (2 ** (attempt - 1)))
+        return {'details': None, 'error': error, 'attempts': attempt,
+                'content_hash': None, 'unchanged': False}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(fetch_one, publish_no): publish_no for publish_no in dict.fromkeys(publish_nos)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+def fetch_company_details(publish_nos, concurrency=4, rate=None, retries=3, backoff=0.5, session=None,
+                          known_hashes=None):
+    """
+    Fetches and parses many disclosures in parallel.
+    Requests go through the shared CLIENT and its global rate limit; `rate`
+    (requests/sec) additionally caps this batch. Connection errors, timeouts
+    and 5xx/429 responses are tried up to `retries` times in all (at least 1)
+    with exponential backoff; other errors (404, parse failures) are not retried.
+    If `known_hashes` ({publish_no: content_hash}) is given, pages whose content
+    hash is unchanged are not parsed and come back with 'unchanged': True.
+    Returns a dict keyed by publish_no, in input order:
+    {publish_no: {'details': {...} or None, 'error': '...' or None, 'attempts': n,
+                  'content_hash': '...' or None, 'unchanged': bool}}
+    """
+    publish_nos = list(dict.fromkeys(publish_nos))
+    results = dict(iter_company_details(publish_nos, concurrency, rate, retries, backoff, session, known_hashes))
+    return {publish_no: results[publish_no] for publish_no in publish_nos}
+
 if __name__ == "__main__":
     # Test for the specific case requested by user: publishNo=3626
     print("Testing for PublishNo: 3626 ((주)우리은행)")
@@ -0,0 +1,227 @@
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class SqliteStore:
+    """
+    Key/value store in one SQLite file (WAL mode) that every worker process
+    opens, so readers never block the writer. Values are JSON.
+    Also holds named leases used to elect a single refresher.
+    """
+
+    def __init__(self, path):
+        # Autocommit; lease updates open their own IMMEDIATE transaction
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS leases ("
+            "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def add(self, key, value):
+        """
+        Sets `key` only if it is absent; returns the value now stored.
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO kv (key, value) VALUES (?, ?)",
+                (key, json.dumps(value, ensure_ascii=False))
+            )
+            row = self._db.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0])
+
+    def delete(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+    def acquire_lease(self, name, owner, ttl):
+        """
+        Takes (or renews, if `owner` already holds it) the lease `name` for
+        `ttl` seconds. Returns False while another owner's lease is live.
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+                if row and row[0] != owner and row[1] > now:
+                    return False
+                self._db.execute(
+                    "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                    (name, owner, now + ttl)
+                )
+                return True
+            finally:
+                self._db.execute("COMMIT")
+
+    def release_lease(self, name, owner):
+        with self._lock:
+            self._db.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+
+class RedisStore:
+    """
+    Same interface as SqliteStore on top of a redis-py client (or FakeRedis).
+    Keys are namespaced with `prefix`.
+    """
+
+    def __init__(self, client, prefix='psci:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False))
+
+    def add(self, key, value):
+        """
+        Sets `key` only if it is absent; returns the value now stored.
+        """
+        if self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), nx=True):
+            return value
+        return self.get(key)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def acquire_lease(self, name, owner, ttl):
+        key = self.prefix + 'lease:' + name
+        if self.client.set(key, owner, nx=True, px=int(ttl * 1000)):
+            return True
+        # Renew our own lease. The check and the renewal are two commands, so a
+        # lease that expires in between can briefly have two holders; refreshes
+        # are idempotent, which makes that harmless here.
+        current = self.client.get(key)
+        if current is not None and _text(current) == owner:
+            return bool(self.client.set(key, owner, xx=True, px=int(ttl * 1000)))
+        return False
+
+    def release_lease(self, name, owner):
+        key = self.prefix + 'lease:' + name
+        current = self.client.get(key)
+        if current is not None and _text(current) == owner:
+            self.client.delete(key)
+
+
+def _text(value):
+    return value.decode('utf-8') if isinstance(value, bytes) else value
+
+
+class FakeRedis:
+    """
+    In-process stand-in for the few redis-py calls RedisStore makes
+    (get, set with nx/xx/px, delete), for local runs and tests without a server.
+    Values come back as bytes like redis-py's default client.
+    """
+
+    def __init__(self):
+        self._data = {}  # key -> (bytes, expires_at or None)
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        # Caller must hold self._lock
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key, value, nx=False, xx=False, px=None):
+        with self._lock:
+            exists = self._live(key) is not None
+            if (nx and exists) or (xx and not exists):
+                return None
+            if isinstance(value, str):
+                value = value.encode('utf-8')
+            self._data[key] = (value, time.time() + px / 1000 if px else None)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+def open_store(url):
+    """
+    Store from a URL:
+    - sqlite:///relative/path.db or sqlite:////absolute/path.db
+    - redis://host:6379/0 (needs the redis package)
+    - fakeredis:// (in-process only, not shared between workers)
+    """
+    scheme = urlparse(url).scheme
+    if scheme == 'sqlite':
+        return SqliteStore(url[len('sqlite:///'):])
+    if scheme in ('redis', 'rediss'):
+        import redis  # optional dependency
+        return RedisStore(redis.Redis.from_url(url))
+    if scheme == 'fakeredis':
+        return RedisStore(FakeRedis())
+    raise ValueError(f"Unsupported store URL: {url}")
+
+
+class SharedDetailCache:
+    """
+    DetailCache interface (get/set/invalidate/stats) backed by a shared store
+    instead of per-process memory, so every worker sees the same details and
+    worker memory does not grow with the number of companies.
+    """
+
+    def __init__(self, store, ttl=3600, stale_ttl=86400):
+        self.store = store
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get(self, key, count=True):
+        """
+        Returns (value, is_fresh). Value is None on a miss.
+        Lookups are counted in `stats` unless count=False (the refresher's own reads).
+        """
+        entry = self.store.get('detail:' + key)
+        now = time.time()
+        if entry is None or now > entry['expires_at'] + self.stale_ttl:
+            if count:
+                self._count('misses')
+            return None, False
+        fresh = now <= entry['expires_at']
+        if count:
+            self._count('hits' if fresh else 'stale_hits')
+        return entry['value'], fresh
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self.store.set('detail:' + key, {'value': value, 'expires_at': expires_at})
+
+    def invalidate(self, key):
+        self.store.delete('detail:' + key)
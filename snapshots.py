@@ -0,0 +1,122 @@
+import json
+import os
+import time
+from disclosure import DisclosureStats
+
+SNAPSHOT_FILE = "latest_snapshot.json"
+
+
+class SnapshotStore:
+    """
+    Last seen state of each disclosure, keyed by publish_no:
+    {publish_no: {'name', 'content_hash', 'stats', 'updated_at'}}
+    Kept as one JSON file, rewritten atomically by save(). Feeding hashes()
+    to scraper.fetch_company_details as known_hashes makes unchanged pages
+    skip parsing; their stats come from the store instead.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def hashes(self):
+        return {publish_no: entry['content_hash'] for publish_no, entry in self.entries.items()}
+
+    def get(self, publish_no):
+        return self.entries.get(publish_no)
+
+    def put(self, details, content_hash):
+        """
+        Records freshly parsed details; returns the entry it replaced (None if new).
+        """
+        previous = self.entries.get(details['publish_no'])
+        self.entries[details['publish_no']] = {
+            'name': details['name'],
+            'content_hash': content_hash,
+            'stats': details['stats'],
+            'updated_at': time.time(),
+        }
+        return previous
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def diff_stats(old_row, new_row):
+    """
+    Metrics that differ between two stats rows (JSON form of DisclosureStats):
+    [{'metric', 'old', 'new', 'delta'}]. `delta` is new - old when both parse
+    as numbers, else None.
+    """
+    old, new = DisclosureStats.from_row(old_row), DisclosureStats.from_row(new_row)
+    changes = []
+    for field, before, after in zip(DisclosureStats._fields, old, new):
+        if before.raw == after.raw:
+            continue
+        delta = None
+        if before.value is not None and after.value is not None:
+            delta = after.value - before.value
+        changes.append({'metric': field, 'old': before.display, 'new': after.display, 'delta': delta})
+    return changes
+
+
+def format_delta(delta):
+    if delta is None:
+        return ""
+    if isinstance(delta, int):
+        return f"{delta:+,}"
+    return f"{delta:+,.1f}"
+
+
+class SnapshotDiff:
+    """
+    Collects what changed during one run against a SnapshotStore.
+    """
+
+    def __init__(self):
+        self.added = []    # company names
+        self.changed = []  # (company name, diff_stats(...) list)
+        self.unchanged = 0
+
+    def mark_unchanged(self):
+        self.unchanged += 1
+
+    def record(self, details, previous):
+        """
+        Call with new details and the store entry they replaced.
+        """
+        if previous is None:
+            self.added.append(details['name'])
+            return
+        changes = diff_stats(previous['stats'], details['stats'])
+        if changes:
+            self.changed.append((details['name'], changes))
+        else:
+            # Page bytes changed but none of the figures did
+            self.unchanged += 1
+
+    def to_markdown(self):
+        lines = [
+            f"New: {len(self.added)}, changed: {len(self.changed)}, unchanged: {self.unchanged}",
+            "",
+        ]
+        if self.added:
+            lines.append("## New")
+            lines.extend(f"- {name}" for name in self.added)
+            lines.append("")
+        if self.changed:
+            lines.append("## Changed")
+            lines.append("| Company | Metric | Before | After | Delta |")
+            lines.append("|:---|:---|:---|:---|---:|")
+            for name, changes in self.changed:
+                for change in changes:
+                    delta = format_delta(change['delta'])
+                    lines.append(f"| {name} | {change['metric']} | {change['old']} | {change['new']} | {delta} |")
+            lines.append("")
+        return "\n".join(lines)
@@ -0,0 +1,88 @@
+import hashlib
+import re
+import threading
+
+# Splits serialized HTML into [text, tag, text, tag, ..., text]
+TAG_PATTERN = re.compile(r'(<[^>]*>)')
+
+
+class TableTemplates:
+    """
+    Compact storage for status tables (the 'table_html' of scraped details).
+    Every company's table has the same markup and row labels; only the
+    figures differ. The first table seen with a given tag structure becomes
+    the template, stored once; a company then keeps only the text segments
+    that differ from it and the HTML is rebuilt on demand, byte for byte.
+
+    Templates are kept in `store` (shared_store.SqliteStore/RedisStore) so
+    compact entries written by one process render in every other one.
+    """
+
+    KEY_PREFIX = 'table_template:'
+
+    def __init__(self, store=None):
+        self.store = store
+        self._templates = {}  # template id -> tuple of segments
+        self._lock = threading.Lock()
+
+    def _template(self, template_id, segments=None):
+        """
+        Template for `template_id`; if unknown and `segments` is given, those
+        become the template unless another process registered one first.
+        """
+        template = self._templates.get(template_id)
+        if template is not None:
+            return template
+        with self._lock:
+            if self.store is not None:
+                key = self.KEY_PREFIX + template_id
+                stored = self.store.add(key, list(segments)) if segments is not None else self.store.get(key)
+                template = tuple(stored) if stored is not None else None
+            elif segments is not None:
+                template = tuple(segments)
+            if template is not None:
+                template = self._templates.setdefault(template_id, template)
+        return template
+
+    def compact(self, table_html):
+        """
+        Flat list [template id, segment index, text, segment index, text, ...]
+        for `table_html`: one small list per company, JSON-serializable as is.
+        """
+        segments = TAG_PATTERN.split(table_html)
+        template_id = hashlib.sha1('\x00'.join(segments[1::2]).encode('utf-8')).hexdigest()[:16]
+        template = self._template(template_id, segments)
+        table = [template_id]
+        for i in range(0, len(segments), 2):
+            if segments[i] != template[i]:
+                table += (i, segments[i])
+        return table
+
+    def render(self, table):
+        template = self._template(table[0])
+        if template is None:
+            raise KeyError(f"Unknown table template {table[0]}")
+        segments = list(template)
+        for n in range(1, len(table), 2):
+            segments[table[n]] = table[n + 1]
+        return ''.join(segments)
+
+    def compact_details(self, details):
+        """
+        Details dict with 'table_html' replaced by its compact 'table' form.
+        """
+        if 'table_html' not in details:
+            return details
+        details = dict(details)
+        details['table'] = self.compact(details.pop('table_html'))
+        return details
+
+    def expand_details(self, details):
+        """
+        Inverse of compact_details: the dict shape scraper.parse_company_detail returns.
+        """
+        if 'table' not in details:
+            return details
+        details = dict(details)
+        details['table_html'] = self.render(details.pop('table'))
+        return details
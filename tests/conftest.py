@@ -0,0 +1,57 @@
+import os
+import pytest
+from fixtures import ReplayServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+
+@pytest.fixture
+def replay():
+    """
+    Starts a ReplayServer over the committed fixtures and points scraper at it.
+    Call it with errors={...} (see ReplayServer) to make fixtures fail.
+    """
+    servers = []
+
+    def start(errors=None):
+        server = ReplayServer(FIXTURES_DIR, errors=errors).__enter__()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in reversed(servers):
+        server.__exit__(None, None, None)
+
+
+@pytest.fixture
+def fixture_html():
+    """
+    Reads a recorded page, keeping its line endings as they came off the wire.
+    """
+    def read(name):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8', newline='') as f:
+            return f.read()
+    return read
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    # app.py opens its databases at import: keep them out of the real instance folder
+    os.environ['INSTANCE_PATH'] = str(tmp_path_factory.mktemp('instance'))
+    os.environ.pop('SHARED_STORE', None)
+    import app
+    app.app.config.update(TESTING=True, BACKGROUND_REFRESH=False)
+    with app.app.app_context():
+        app.db.create_all()
+        user = app.User(username='tester', is_approved=True)
+        user.set_password('secret')
+        app.db.session.add(user)
+        app.db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    client = app_module.app.test_client()
+    client.post('/login', data={'username': 'tester', 'password': 'secret'})
+    return client
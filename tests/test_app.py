@@ -0,0 +1,87 @@
+import os
+import pytest
+from refresher import EMPTY_SNAPSHOT
+
+
+@pytest.fixture
+def refreshed(app_module, replay):
+    replay()
+    app_module.REFRESHER.refresh_once()
+    return app_module
+
+
+def test_company_detail_needs_login(app_module):
+    response = app_module.app.test_client().get('/api/company/3600')
+    assert response.status_code == 302
+
+
+def test_company_detail(refreshed, client):
+    response = client.get('/api/company/3600')
+    assert response.status_code == 200
+    assert response.get_etag()[0]
+    body = response.get_json()
+    assert body['name'] == '(주)우리은행'
+    assert body['stats']['it_investment']['value'] == 1000000
+    assert 'extracted-table' in body['table_html']
+
+
+def test_company_detail_not_modified(refreshed, client):
+    etag, _ = client.get('/api/company/3601').get_etag()
+    response = client.get('/api/company/3601', headers={'If-None-Match': f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_company_detail_etag_per_encoding(refreshed, client):
+    identity, _ = client.get('/api/company/3601').get_etag()
+    response = client.get('/api/company/3601', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.get_etag() == (f'{identity}-gzip', False)
+
+    # Any encoding the client holds validates the same content
+    response = client.get('/api/company/3601', headers={'Accept-Encoding': 'gzip', 'If-None-Match': f'"{identity}"'})
+    assert response.status_code == 304
+    assert response.get_etag() == (f'{identity}-gzip', False)
+
+
+def test_company_payload_built_on_request(refreshed, client):
+    refreshed.PAYLOAD_CACHE.clear()
+    content_hash = refreshed.REFRESHER.snapshot.content_hashes['3602']
+    client.get('/api/company/3602')
+    assert refreshed.PAYLOAD_CACHE.get('3602', content_hash) is not None
+    # Rebuilt once the refresher has moved on to new content
+    assert refreshed.PAYLOAD_CACHE.get('3602', 'newer-hash') is None
+    assert refreshed.PAYLOAD_CACHE.max_entries == refreshed.app.config['PAYLOAD_CACHE_SIZE']
+
+
+def test_company_detail_not_found(refreshed, client):
+    assert client.get('/api/company/9999').status_code == 404
+
+
+def test_company_detail_before_first_refresh(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.REFRESHER, '_snapshot', EMPTY_SNAPSHOT)
+    assert client.get('/api/company/9999').status_code == 503
+
+
+def test_home_shows_placeholder_before_first_refresh(app_module, client, monkeypatch):
+    monkeypatch.setattr(app_module.REFRESHER, '_snapshot', EMPTY_SNAPSHOT)
+    response = client.get('/home')
+    assert response.status_code == 200
+    assert '데이터 준비 중' in response.get_data(as_text=True)
+
+
+def test_requests_do_not_start_refresher_when_disabled(app_module, client):
+    client.get('/home')
+    assert not app_module.REFRESHER.started
+
+
+def test_metrics_only_for_local_clients(app_module):
+    client = app_module.app.test_client()
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.7'}).status_code == 404
+
+
+def test_metrics_label_worker_with_shared_store(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'SHARED_STORE', object())
+    body = app_module.app.test_client().get('/metrics').get_data(as_text=True)
+    assert f'detail_cache_hits_total{{worker="{os.getpid()}"}}' in body
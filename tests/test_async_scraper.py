@@ -0,0 +1,21 @@
+import asyncio
+import async_scraper
+
+
+def test_list_in_page_order(replay):
+    replay(errors={'list_2.html': 500})
+    companies = asyncio.run(async_scraper.fetch_company_list(max_pages=3))
+    # Page 2 failed and page 3 is past the end of the list
+    assert [company['publish_no'] for company in companies] == ['3600', '3601', '3602', '3603', '3604']
+
+
+def test_detail(replay):
+    replay()
+    details = asyncio.run(async_scraper.fetch_company_detail('3601'))
+    assert details['name'] == '신한은행'
+    assert details['stats'].security_investment.value == 200000
+
+
+def test_detail_not_found(replay):
+    replay()
+    assert asyncio.run(async_scraper.fetch_company_detail('9999')) is None
@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import pytest
+from werkzeug.security import generate_password_hash
+from models import User, normalize_hash_method
+
+
+@pytest.fixture
+def make_user(app_module):
+    created = []
+
+    def make(username, password_hash=None, **columns):
+        with app_module.app.app_context():
+            user = User(username=username, **columns)
+            if password_hash is None:
+                user.set_password('secret')
+            else:
+                user.password_hash = password_hash
+            app_module.db.session.add(user)
+            app_module.db.session.commit()
+            created.append(user.id)
+            return user.id
+
+    yield make
+    with app_module.app.app_context():
+        for user_id in created:
+            user = app_module.db.session.get(User, user_id)
+            if user is not None:
+                app_module.db.session.delete(user)
+        app_module.db.session.commit()
+
+
+def stored_hash(app_module, user_id):
+    with app_module.app.app_context():
+        return app_module.db.session.get(User, user_id).password_hash
+
+
+@pytest.mark.parametrize('method', ['pbkdf2:sha256', 'scrypt'])
+def test_default_parameters_match_werkzeug(method, monkeypatch):
+    # Breaks when werkzeug changes its defaults without normalize_hash_method following
+    monkeypatch.setattr(User, 'HASH_METHOD', method)
+    user = User(username='u')
+    user.set_password('secret')
+    assert user.password_hash.startswith(normalize_hash_method(method) + '$')
+    assert not user.needs_rehash()
+
+
+def test_login_rehashes_old_parameters(app_module, make_user):
+    user_id = make_user('old-hash', generate_password_hash('secret', method='pbkdf2:sha256:1000'), is_approved=True)
+    client = app_module.app.test_client()
+    response = client.post('/login', data={'username': 'old-hash', 'password': 'secret'})
+    assert response.status_code == 302
+    assert stored_hash(app_module, user_id).startswith(normalize_hash_method(User.HASH_METHOD) + '$')
+
+
+def test_failed_login_keeps_old_hash(app_module, make_user):
+    old = generate_password_hash('secret', method='pbkdf2:sha256:1000')
+    user_id = make_user('old-hash-wrong', old, is_approved=True)
+    app_module.app.test_client().post('/login', data={'username': 'old-hash-wrong', 'password': 'wrong'})
+    assert stored_hash(app_module, user_id) == old
+
+
+@pytest.mark.parametrize('action', ['approve', 'reject'])
+def test_admin_actions_invalidate_user_cache(app_module, make_user, action):
+    make_user(f'admin-{action}', is_approved=True, is_admin=True)
+    user_id = make_user(f'pending-{action}')
+    admin = app_module.app.test_client()
+    admin.post('/login', data={'username': f'admin-{action}', 'password': 'secret'})
+    app_module.USER_CACHE.set(user_id, {'id': user_id, 'username': f'pending-{action}',
+                                        'is_approved': False, 'is_admin': False})
+
+    admin.get(f'/home/fsiadmin/{action}/{user_id}')
+    assert app_module.USER_CACHE.get(user_id) is None
+
+
+def test_verify_login_times_out_and_cancels_queued_check(app_module, monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    monkeypatch.setattr(app_module, 'LOGIN_EXECUTOR', executor)
+    monkeypatch.setitem(app_module.app.config, 'LOGIN_TIMEOUT', 0.05)
+    checked = []
+    monkeypatch.setattr(app_module, 'verify_password_hash', lambda *args: checked.append(args) or True)
+    # Another login's check holds the only worker
+    executor.submit(release.wait)
+    try:
+        assert app_module.verify_login(SimpleNamespace(password_hash='x'), 'secret') is None
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+    assert checked == []
+
+
+def test_login_timeout_asks_to_retry(app_module, make_user, monkeypatch):
+    make_user('slow', is_approved=True)
+    monkeypatch.setattr(app_module, 'verify_login', lambda user, password: None)
+    response = app_module.app.test_client().post('/login', data={'username': 'slow', 'password': 'secret'})
+    assert '잠시 후 다시 시도' in response.get_data(as_text=True)
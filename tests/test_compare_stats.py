@@ -0,0 +1,22 @@
+import compare_stats
+
+
+def report_names(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.split(' | ')[0].lstrip('| ') for line in f.read().splitlines()[2:]]
+
+
+def test_rows_follow_target_order(replay, tmp_path, monkeypatch, capsys):
+    replay()
+    monkeypatch.chdir(tmp_path)
+    # 한화투자증권(주) is close to the listed 한국투자증권(주) but must not take its figures
+    targets = ['토스뱅크㈜', '한화투자증권(주)', '(주)우리은행', '대신증권', '신한 은행']
+    monkeypatch.setattr(compare_stats, 'TARGET_NAMES', targets)
+    compare_stats.main(['--pages', '2', '--formats', 'md,csv'])
+
+    assert report_names(tmp_path / 'latest_results.md') == targets
+    with open(tmp_path / 'latest_results.md', encoding='utf-8') as f:
+        assert '| 한화투자증권(주) | Not Found |' in f.read()
+    out = capsys.readouterr().out
+    assert 'Did you mean 한국투자증권(주)' in out
+    assert 'Markdown saved to latest_results.md\n' in out
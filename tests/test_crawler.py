@@ -0,0 +1,46 @@
+import json
+import pytest
+import requests
+import crawler
+
+FIXTURE_NOS = [str(no) for no in range(3600, 3610)]
+
+
+def read_records(out_dir):
+    with open(out_dir / crawler.DETAILS_FILE, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def read_checkpoint(out_dir):
+    with open(out_dir / crawler.CHECKPOINT_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_list_pages_retry_transient_errors(replay, tmp_path):
+    replay(errors={'list_2.html': [503, 429]})
+    crawler.crawl(['금융 및 보험업'], ['2025'], str(tmp_path), backoff=0)
+    assert [record['publish_no'] for record in read_records(tmp_path)] == FIXTURE_NOS
+
+
+def test_resume_after_interruption(replay, tmp_path):
+    replay(errors={'list_2.html': 503, 'detail_3602.html': 503})
+    with pytest.raises(requests.HTTPError):
+        crawler.crawl(['금융 및 보험업'], ['2025'], str(tmp_path), retries=2, backoff=0)
+
+    checkpoint = read_checkpoint(tmp_path)
+    assert [entry['publish_no'] for entry in checkpoint['_failed']] == ['3602']
+    assert len(read_records(tmp_path)) == 4
+    # A record half-written when the process died
+    with open(tmp_path / crawler.DETAILS_FILE, 'ab') as f:
+        f.write(b'{"sector": "')
+
+    replay()
+    crawler.crawl(['금융 및 보험업'], ['2025'], str(tmp_path), backoff=0)
+
+    publish_nos = [record['publish_no'] for record in read_records(tmp_path)]
+    assert sorted(publish_nos) == FIXTURE_NOS
+    # The failed disclosure is fetched again first, before the remaining page
+    assert publish_nos[4] == '3602'
+    checkpoint = read_checkpoint(tmp_path)
+    assert checkpoint['_failed'] == []
+    assert checkpoint['_offset'] == (tmp_path / crawler.DETAILS_FILE).stat().st_size
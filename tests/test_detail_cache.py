@@ -0,0 +1,100 @@
+import threading
+import time
+import pytest
+from detail_cache import DetailCache
+from shared_store import FakeRedis, RedisStore, SharedDetailCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def test_fresh_then_stale_then_gone(clock):
+    cache = DetailCache(ttl=10, stale_ttl=20)
+    cache.set('3600', {'name': 'a'})
+    assert cache.get('3600') == ({'name': 'a'}, True)
+    clock[0] += 15
+    assert cache.get('3600') == ({'name': 'a'}, False)
+    clock[0] += 20
+    assert cache.get('3600') == (None, False)
+    assert cache.stats == {'hits': 1, 'stale_hits': 1, 'misses': 1, 'disk_hits': 0}
+
+
+def test_uncounted_lookups(clock):
+    cache = DetailCache(ttl=10)
+    cache.set('3600', {'name': 'a'})
+    cache.get('3600', count=False)
+    cache.get('9999', count=False)
+    assert cache.stats == {'hits': 0, 'stale_hits': 0, 'misses': 0, 'disk_hits': 0}
+
+
+def test_sqlite_tier_survives_restart(tmp_path, clock):
+    path = str(tmp_path / 'detail_cache.db')
+    DetailCache(path, ttl=10).set('3600', {'name': '(주)우리은행'})
+
+    cache = DetailCache(path, ttl=10, stale_ttl=20)
+    assert cache.get('3600') == ({'name': '(주)우리은행'}, True)
+    # Second read comes from memory
+    assert cache.get('3600') == ({'name': '(주)우리은행'}, True)
+    assert cache.stats['disk_hits'] == 1
+    assert cache.stats['hits'] == 2
+
+
+def test_sqlite_tier_keeps_expiry(tmp_path, clock):
+    path = str(tmp_path / 'detail_cache.db')
+    DetailCache(path, ttl=10).set('3600', {'name': 'a'})
+    clock[0] += 40
+    assert DetailCache(path, ttl=10, stale_ttl=20).get('3600') == (None, False)
+
+
+def test_memory_tier_evicts_but_sqlite_keeps(tmp_path):
+    cache = DetailCache(str(tmp_path / 'detail_cache.db'), max_entries=1)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert list(cache._memory) == ['b']
+    assert cache.get('a') == (1, True)
+    assert cache.stats['disk_hits'] == 1
+
+
+def test_invalidate_removes_both_tiers(tmp_path):
+    path = str(tmp_path / 'detail_cache.db')
+    cache = DetailCache(path)
+    cache.set('3600', 1)
+    cache.invalidate('3600')
+    assert cache.get('3600') == (None, False)
+    assert DetailCache(path).get('3600') == (None, False)
+
+
+@pytest.mark.parametrize('make_cache', [
+    lambda: DetailCache(),
+    lambda: SharedDetailCache(RedisStore(FakeRedis())),
+])
+def test_counters_do_not_lose_updates(make_cache):
+    cache = make_cache()
+    cache.set('hit', 1)
+
+    def lookups():
+        for _ in range(500):
+            cache.get('hit')
+            cache.get('miss')
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.stats['hits'] == 4000
+    assert cache.stats['misses'] == 4000
+
+
+def test_shared_cache_stale_window(clock):
+    cache = SharedDetailCache(RedisStore(FakeRedis()), ttl=10, stale_ttl=20)
+    cache.set('3600', {'name': 'a'})
+    clock[0] += 15
+    assert cache.get('3600') == ({'name': 'a'}, False)
+    clock[0] += 20
+    assert cache.get('3600') == (None, False)
+    assert cache.stats == {'hits': 0, 'stale_hits': 1, 'misses': 1}
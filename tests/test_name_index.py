@@ -0,0 +1,32 @@
+from name_index import NameIndex
+
+COMPANIES = [
+    {'name': '(주)우리은행', 'publish_no': '3600'},
+    {'name': '신한은행', 'publish_no': '3601'},
+    {'name': '주식회사 국민은행', 'publish_no': '3602'},
+    {'name': '하나은행', 'publish_no': '3608'},
+    {'name': '한국투자증권(주)', 'publish_no': '3605'},
+]
+
+
+def names(companies):
+    return [company['name'] for company in companies]
+
+
+def test_exact_query_is_not_padded_with_fuzzy_hits():
+    assert names(NameIndex(COMPANIES).search('(주) 국민은행')) == ['주식회사 국민은행']
+
+
+def test_substring_matches_shortest_first():
+    assert names(NameIndex(COMPANIES).search('은행')) == ['주식회사 국민은행', '신한은행', '(주)우리은행', '하나은행']
+
+
+def test_fuzzy_only_without_other_matches():
+    index = NameIndex(COMPANIES)
+    assert names(index.search('국민운행')) == ['주식회사 국민은행']
+    assert index.search('토스뱅크') == []
+
+
+def test_fuzzy_ties_are_ordered_by_name():
+    results = NameIndex(COMPANIES).fuzzy('한은행', limit=5, cutoff=0.5)
+    assert [name for name, _ in results] == ['신한은행', '국민은행', '우리은행', '하나은행']
@@ -0,0 +1,27 @@
+from payloads import PayloadCache, build_payload, representation_etag, representation_etags
+
+
+def test_payload_cache_misses_other_versions():
+    cache = PayloadCache(max_entries=2)
+    payload = cache.set('3600', build_payload('{"a": 1}'), 'hash-1')
+    assert cache.get('3600', 'hash-1') is payload
+    assert cache.get('3600', 'hash-2') is None
+    assert cache.get('3600') is None
+
+
+def test_payload_cache_evicts_least_recently_used():
+    cache = PayloadCache(max_entries=2)
+    for key in ('a', 'b'):
+        cache.set(key, build_payload(key))
+    cache.get('a')
+    cache.set('c', build_payload('c'))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+
+
+def test_each_encoding_has_its_own_etag():
+    payload = build_payload('{"a": 1}')
+    etags = representation_etags(payload)
+    assert etags[0] == payload.etag
+    assert representation_etag(payload, 'gzip') == f"{payload.etag}-gzip"
+    assert len(set(etags)) == len(etags)
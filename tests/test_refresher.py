@@ -0,0 +1,42 @@
+import time
+from detail_cache import DetailCache
+from refresher import SnapshotRefresher
+from shared_store import FakeRedis, RedisStore, SqliteStore
+
+
+def make_refresher(store, **kwargs):
+    return SnapshotRefresher(DetailCache(), store=store, **kwargs)
+
+
+def test_lease_is_handed_back_on_release(tmp_path):
+    store = SqliteStore(str(tmp_path / 'shared.db'))
+    old, new = make_refresher(store), make_refresher(store)
+    assert old.is_leader()
+    assert not new.is_leader()
+    old.release_lease()
+    assert new.is_leader()
+
+
+def test_release_keeps_another_owners_lease():
+    store = RedisStore(FakeRedis())
+    leader, follower = make_refresher(store), make_refresher(store)
+    assert leader.is_leader()
+    follower.release_lease()
+    assert not follower.is_leader()
+
+
+def test_heartbeat_renews_lease_during_long_refresh(monkeypatch):
+    store = RedisStore(FakeRedis())
+    leader = make_refresher(store, lease_ttl=0.3)
+    follower = make_refresher(store, lease_ttl=0.3)
+    monkeypatch.setattr(leader, 'refresh_once', lambda: time.sleep(1))
+    leader.start()
+    try:
+        time.sleep(0.6)
+        assert leader._leading
+        assert not follower.is_leader()
+    finally:
+        leader.stop()
+    # The stopped leader hands the lease back once its refresh returns
+    time.sleep(1.2)
+    assert follower.is_leader()
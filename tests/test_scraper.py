@@ -0,0 +1,108 @@
+import pytest
+import scraper
+
+FIXTURE_NOS = [str(no) for no in range(3600, 3610)]
+
+
+def test_list_pages_come_back_in_page_order(replay):
+    replay()
+    companies, errors = scraper.fetch_company_list_concurrent(concurrency=4)
+    assert errors == []
+    assert [company['publish_no'] for company in companies] == FIXTURE_NOS
+
+
+def test_list_failed_page_is_reported_and_skipped(replay):
+    replay(errors={'list_2.html': 500})
+    companies, errors = scraper.fetch_company_list_concurrent(max_pages=2)
+    assert [company['publish_no'] for company in companies] == FIXTURE_NOS[:5]
+    assert [error['page'] for error in errors] == [2]
+    assert '500' in errors[0]['error']
+
+
+def test_list_without_first_page_is_empty(replay):
+    replay(errors={'list_1.html': 500})
+    companies, errors = scraper.fetch_company_list_concurrent()
+    assert companies == []
+    assert [error['page'] for error in errors] == [1]
+
+
+def test_details_come_back_in_input_order(replay):
+    replay()
+    publish_nos = ['3605', '3600', '3603', '3600']
+    results = scraper.fetch_company_details(publish_nos, concurrency=3)
+    assert list(results) == ['3605', '3600', '3603']
+    assert results['3600']['details']['name'] == '(주)우리은행'
+    assert results['3600']['details']['stats'].it_investment.value == 1000000
+
+
+def test_details_retry_server_errors(replay):
+    replay(errors={'detail_3600.html': [503, 429]})
+    result = scraper.fetch_company_details(['3600'], backoff=0)['3600']
+    assert result['error'] is None
+    assert result['attempts'] == 3
+    assert result['details']['name'] == '(주)우리은행'
+
+
+def test_details_give_up_after_retries(replay):
+    replay(errors={'detail_3600.html': 503})
+    result = scraper.fetch_company_details(['3600'], retries=2, backoff=0)['3600']
+    assert result['details'] is None
+    assert result['attempts'] == 2
+    assert '503' in result['error']
+
+
+def test_details_do_not_retry_not_found(replay):
+    replay()
+    result = scraper.fetch_company_details(['9999'], backoff=0)['9999']
+    assert result['details'] is None
+    assert result['attempts'] == 1
+    assert '404' in result['error']
+
+
+def test_details_unchanged_pages_are_not_parsed(replay, monkeypatch):
+    replay()
+    first = scraper.fetch_company_details(['3600', '3601'])
+    known_hashes = {'3600': first['3600']['content_hash'], '3601': 'stale'}
+
+    def fail(html, publish_no):
+        raise AssertionError(f"{publish_no} parsed again")
+    monkeypatch.setattr(scraper, 'parse_company_detail', fail)
+    second = scraper.fetch_company_details(['3600'], known_hashes=known_hashes)
+    assert second['3600']['unchanged'] is True
+    assert second['3600']['details'] is None
+    assert second['3600']['content_hash'] == first['3600']['content_hash']
+
+
+@pytest.mark.parametrize('publish_no', FIXTURE_NOS)
+def test_lxml_parser_matches_bs4(fixture_html, publish_no):
+    html = fixture_html(f"detail_{publish_no}.html")
+    assert not scraper.lxml_diverges(html)
+    assert scraper.parse_company_detail_lxml(html, publish_no) == scraper.parse_company_detail_bs4(html, publish_no)
+
+
+@pytest.mark.parametrize('old, new', [
+    ('<td>100,000 원</td>', '<td nowrap>100,000 원</td>'),
+    ('<td></td><td>100,000 원</td></tr>', '<td><td>100,000 원</tr>'),
+    ('100,000 원</td></tr>', '100,000 원</td>'),
+    ('<p>설명 &amp; 주의</p>', '<p>설명 &amp; 주의'),
+])
+def test_divergent_markup_falls_back_to_bs4(fixture_html, monkeypatch, old, new):
+    html = fixture_html("detail_3600.html")
+    assert old in html
+    html = html.replace(old, new, 1)
+    assert scraper.lxml_diverges(html)
+    monkeypatch.setattr(scraper, 'DETAIL_PARSER', 'lxml')
+    assert scraper.parse_company_detail(html, '3600') == scraper.parse_company_detail_bs4(html, '3600')
+
+
+def test_details_reject_zero_retries():
+    with pytest.raises(ValueError):
+        scraper.fetch_company_details(['3600'], retries=0)
+
+
+@pytest.mark.parametrize('markup', ['<span>도움말<br/>닫기</span>', '<span>도움말<!-- 닫기 --></span>'])
+def test_container_with_several_bad_strings(fixture_html, markup):
+    html = fixture_html("detail_3600.html").replace('<span>도움말</span>', markup, 1)
+    assert markup in html
+    assert not scraper.lxml_diverges(html)
+    assert scraper.parse_company_detail_lxml(html, '3600') == scraper.parse_company_detail_bs4(html, '3600')
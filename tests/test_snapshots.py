@@ -0,0 +1,55 @@
+import json
+from disclosure import build_stats
+from snapshots import SnapshotDiff, SnapshotStore, diff_stats
+
+
+def stats(it_investment="1,000,000 원", security_personnel="계 3.5명"):
+    return build_stats({'it_investment': it_investment, 'security_personnel': security_personnel})
+
+
+def details(name='(주)우리은행', **figures):
+    return {'publish_no': '3600', 'name': name, 'stats': stats(**figures)}
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / 'latest_snapshot.json')
+    store = SnapshotStore(path)
+    assert store.put(details(), 'hash-1') is None
+    store.save()
+
+    reloaded = SnapshotStore(path)
+    assert reloaded.hashes() == {'3600': 'hash-1'}
+    # Stats come back in their JSON form, which diff_stats reads as well
+    assert reloaded.get('3600')['stats'] == json.loads(json.dumps(stats()))
+    previous = reloaded.put(details(it_investment="1,200,000 원"), 'hash-2')
+    assert previous['content_hash'] == 'hash-1'
+
+
+def test_diff_stats_deltas():
+    changes = diff_stats(stats(), stats(it_investment="1,200,000 원", security_personnel="계 4명"))
+    assert changes == [
+        {'metric': 'it_investment', 'old': "1,000,000 원", 'new': "1,200,000 원", 'delta': 200000},
+        {'metric': 'security_personnel', 'old': "계 3.5명", 'new': "계 4명", 'delta': 0.5},
+    ]
+
+
+def test_diff_stats_without_numbers():
+    changes = diff_stats(stats(), stats(it_investment="N/A"))
+    assert changes == [{'metric': 'it_investment', 'old': "1,000,000 원", 'new': "N/A", 'delta': None}]
+
+
+def test_snapshot_diff_counts(tmp_path):
+    store = SnapshotStore(str(tmp_path / 'latest_snapshot.json'))
+    diff = SnapshotDiff()
+    diff.record(details(), store.put(details(), 'hash-1'))
+    # Page bytes changed (new hash) but none of the figures did
+    diff.record(details(), store.put(details(), 'hash-2'))
+    diff.record(details(it_investment="900,000 원"), store.put(details(it_investment="900,000 원"), 'hash-3'))
+    diff.mark_unchanged()
+
+    assert diff.added == ['(주)우리은행']
+    assert diff.unchanged == 2
+    assert [name for name, _ in diff.changed] == ['(주)우리은행']
+    report = diff.to_markdown()
+    assert report.startswith("New: 1, changed: 1, unchanged: 2")
+    assert "| (주)우리은행 | it_investment | 1,000,000 원 | 900,000 원 | -100,000 |" in report
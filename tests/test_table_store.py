@@ -0,0 +1,75 @@
+import json
+import pytest
+import scraper
+from shared_store import SqliteStore
+from table_store import TableTemplates
+
+FIXTURE_NOS = [str(no) for no in range(3600, 3610)]
+
+
+@pytest.fixture
+def tables(fixture_html):
+    return {
+        publish_no: scraper.parse_company_detail(fixture_html(f"detail_{publish_no}.html"), publish_no)['table_html']
+        for publish_no in FIXTURE_NOS
+    }
+
+
+def test_round_trip_is_byte_for_byte(tables):
+    templates = TableTemplates()
+    for table_html in tables.values():
+        # Through JSON, as the detail cache stores it
+        table = json.loads(json.dumps(templates.compact(table_html)))
+        assert templates.render(table) == table_html
+    assert len(templates._templates) == 1
+
+
+def test_compact_keeps_only_differing_text(tables):
+    templates = TableTemplates()
+    first = templates.compact(tables['3600'])
+    assert first == first[:1]
+    assert len(templates.compact(tables['3601'])) > 1
+
+
+def test_other_structure_gets_its_own_template(tables):
+    templates = TableTemplates()
+    table_html = tables['3600']
+    extra_row = table_html.replace('</tr>', '</tr><tr><td>비고</td><td>-</td></tr>', 1)
+    assert extra_row != table_html
+
+    compacted = [templates.compact(table_html), templates.compact(extra_row)]
+    assert compacted[0][0] != compacted[1][0]
+    assert [templates.render(table) for table in compacted] == [table_html, extra_row]
+
+
+def test_renders_template_registered_by_another_process(tables, tmp_path):
+    path = str(tmp_path / 'shared.db')
+    writer = TableTemplates(SqliteStore(path))
+    table = writer.compact(tables['3603'])
+
+    reader = TableTemplates(SqliteStore(path))
+    assert reader.render(table) == tables['3603']
+
+
+def test_first_registered_template_wins(tables, tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first, second = TableTemplates(SqliteStore(path)), TableTemplates(SqliteStore(path))
+    first.compact(tables['3600'])
+    # The second process registers from another company's table, but gets the stored template
+    table = second.compact(tables['3601'])
+    assert second._templates == first._templates
+    assert first.render(table) == tables['3601']
+
+
+def test_unknown_template_without_store(tables):
+    table = TableTemplates().compact(tables['3600'])
+    with pytest.raises(KeyError):
+        TableTemplates().render(table)
+
+
+def test_details_round_trip(tables):
+    templates = TableTemplates()
+    details = {'name': '(주)우리은행', 'publish_no': '3600', 'table_html': tables['3600']}
+    compact = templates.compact_details(details)
+    assert 'table_html' not in compact
+    assert templates.expand_details(compact) == details
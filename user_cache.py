@@ -0,0 +1,42 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class UserCache:
+    """
+    Short-lived LRU of user rows for flask_login's user_loader, so
+    authenticated requests do not hit the database just to rebuild current_user.
+    Stores plain column dicts, not ORM instances, so nothing is tied to a
+    finished request's session. Call invalidate() whenever a user row changes;
+    `ttl` bounds how stale another worker process can be.
+    """
+
+    def __init__(self, ttl=60, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user_id -> (columns, expires_at)
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(user_id)
+                self.stats['hits'] += 1
+                return entry[0]
+            self._entries.pop(user_id, None)
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, user_id, columns):
+        with self._lock:
+            self._entries[user_id] = (columns, time.time() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)